@@ -3,21 +3,57 @@
 Module for calculating matrix determinant
 """
 
+import numpy as np
+check_ndarray = __import__('matrix_engine').check_ndarray
+dense_determinant = __import__('matrix_engine').dense_determinant
+MinorCache = __import__('matrix_engine').MinorCache
+check_dok = __import__('matrix_engine').check_dok
+sparse_rows = __import__('matrix_engine').sparse_rows
+densify = __import__('matrix_engine').densify
+structured_determinant = __import__('matrix_engine').structured_determinant
+sparse_determinant = __import__('matrix_engine').sparse_determinant
 
-def determinant(matrix):
+
+def determinant(matrix, method='elimination', n=None):
     """
     Calculates the determinant of a matrix
 
     Args:
-        matrix: A list of lists whose determinant should be calculated
+        matrix: A list of lists whose determinant should be calculated, a
+                numpy.ndarray of shape (n, n) or (b, n, n), or a sparse
+                dict of keys mapping (row, column) to the non-zero values
+        method: 'elimination' for O(n^3) Bareiss/LU elimination, or
+                'expansion' for exact cofactor expansion over a MinorCache
+                (list and dict input only)
+        n: The size of a dict of keys matrix, by default one more than
+           its largest index
 
     Returns:
-        The determinant of the matrix
+        The determinant of the matrix, or a numpy.ndarray of shape (b,)
+        with one determinant per matrix for a stacked input
 
     Raises:
         TypeError: If matrix is not a list of lists
         ValueError: If matrix is not square
     """
+    # NumPy arrays go through the batched LAPACK backend
+    if isinstance(matrix, np.ndarray):
+        check_ndarray(matrix, "matrix must be a square matrix")
+        return np_determinant(matrix)
+
+    # Dict of keys matrices are reduced sparse, without densifying them
+    if isinstance(matrix, dict):
+        n = check_dok(matrix, "matrix must be a square matrix", n)
+        if n == 0:
+            return 1
+        rows = sparse_rows(matrix, n)
+        if method == 'expansion':
+            return MinorCache(densify(rows)).determinant()
+        det = structured_determinant(rows)
+        if det is None:
+            det = sparse_determinant(rows)
+        return det
+
     # Check if matrix is a list
     if not isinstance(matrix, list):
         raise TypeError("matrix must be a list of lists")
@@ -47,24 +83,23 @@ def determinant(matrix):
     if n == 1:
         return matrix[0][0]
 
-    # Base case: 2x2 matrix
-    if n == 2:
-        return matrix[0][0] * matrix[1][1] - matrix[0][1] * matrix[1][0]
-
-    # Recursive case: use cofactor expansion along first row
-    det = 0
-    for col in range(n):
-        # Create minor matrix by removing first row and current column
-        minor = []
-        for row in range(1, n):
-            minor_row = []
-            for c in range(n):
-                if c != col:
-                    minor_row.append(matrix[row][c])
-            minor.append(minor_row)
-
-        # Calculate cofactor: (-1)^(0+col) * matrix[0][col] * det(minor)
-        cofactor = ((-1) ** col) * matrix[0][col] * determinant(minor)
-        det += cofactor
-
-    return det
+    # Cofactor expansion along the first row, sharing repeated sub-minors
+    if method == 'expansion':
+        return MinorCache(matrix).determinant()
+
+    # Bareiss/LU elimination, or a shortcut for structured matrices
+    return dense_determinant(matrix)
+
+
+def np_determinant(matrices):
+    """
+    Calculates the determinants of a (n, n) or stacked (b, n, n)
+    numpy.ndarray with one vectorized LAPACK LU call
+
+    Args:
+        matrices: A numpy.ndarray of square matrices
+
+    Returns:
+        The determinant, or a numpy.ndarray of shape (b,) of determinants
+    """
+    return np.linalg.det(matrices.astype(float))
@@ -3,21 +3,35 @@
 Module for calculating matrix cofactor
 """
 
+import numpy as np
+check_ndarray = __import__('matrix_engine').check_ndarray
+cofactor_matrix = __import__('matrix_engine').cofactor_matrix
+np_cofactor_matrix = __import__('matrix_engine').np_cofactor_matrix
 
-def cofactor(matrix):
+
+def cofactor(matrix, method='elimination'):
     """
     Calculates the cofactor matrix of a matrix
 
     Args:
-        matrix: A list of lists whose cofactor matrix should be calculated
+        matrix: A list of lists whose cofactor matrix should be calculated,
+                or a numpy.ndarray of shape (n, n) or (b, n, n)
+        method: 'elimination' or 'expansion', see cofactor_matrix
 
     Returns:
-        The cofactor matrix of the input matrix
+        The cofactor matrix of the input matrix, stacked the same way for a
+        numpy.ndarray
 
     Raises:
         TypeError: If matrix is not a list of lists
         ValueError: If matrix is not square or is empty
     """
+    # NumPy arrays go through the batched LAPACK backend
+    if isinstance(matrix, np.ndarray):
+        check_ndarray(matrix, "matrix must be a non-empty square matrix",
+                      non_empty=True)
+        return np_cofactor_matrix(matrix)
+
     # Check if matrix is a list
     if not isinstance(matrix, list):
         raise TypeError("matrix must be a list of lists")
@@ -43,60 +57,5 @@ def cofactor(matrix):
     if n == 1:
         return [[1]]
 
-    # Calculate cofactor matrix
-    cofactor_matrix = []
-
-    for i in range(n):
-        cofactor_row = []
-        for j in range(n):
-            # Create submatrix by removing row i and column j
-            submatrix = []
-            for row_idx in range(n):
-                if row_idx != i:
-                    sub_row = []
-                    for col_idx in range(n):
-                        if col_idx != j:
-                            sub_row.append(matrix[row_idx][col_idx])
-                    submatrix.append(sub_row)
-
-            # Calculate determinant of submatrix (minor)
-            minor_det = determinant(submatrix)
-
-            # Apply the cofactor sign: (-1)^(i+j)
-            cofactor_value = ((-1) ** (i + j)) * minor_det
-            cofactor_row.append(cofactor_value)
-
-        cofactor_matrix.append(cofactor_row)
-
-    return cofactor_matrix
-
-
-def determinant(matrix):
-    """
-    Helper function to calculate determinant
-    """
-    # Handle 1x1 matrix
-    if len(matrix) == 1:
-        return matrix[0][0]
-
-    # Handle 2x2 matrix
-    if len(matrix) == 2:
-        return matrix[0][0] * matrix[1][1] - matrix[0][1] * matrix[1][0]
-
-    # Recursive case for larger matrices
-    det = 0
-    for col in range(len(matrix)):
-        # Create minor matrix
-        minor = []
-        for row in range(1, len(matrix)):
-            minor_row = []
-            for c in range(len(matrix)):
-                if c != col:
-                    minor_row.append(matrix[row][c])
-            minor.append(minor_row)
-
-        # Calculate cofactor
-        cofactor = ((-1) ** col) * matrix[0][col] * determinant(minor)
-        det += cofactor
-
-    return det
+    # Calculate every cofactor from a single elimination
+    return cofactor_matrix(matrix, method)
@@ -3,21 +3,79 @@
 Module for calculating matrix inverse
 """
 
-
-def inverse(matrix):
+import sys
+import numpy as np
+check_ndarray = __import__('matrix_engine').check_ndarray
+dense_inverse = __import__('matrix_engine').dense_inverse
+MinorCache = __import__('matrix_engine').MinorCache
+check_dok = __import__('matrix_engine').check_dok
+sparse_rows = __import__('matrix_engine').sparse_rows
+densify = __import__('matrix_engine').densify
+structured_inverse = __import__('matrix_engine').structured_inverse
+to_fractions = __import__('matrix_engine').to_fractions
+
+
+def inverse(matrix, exact=False, method='elimination', n=None):
     """
     Calculates the inverse of a matrix
 
     Args:
-        matrix: A list of lists whose inverse should be calculated
+        matrix: A list of lists whose inverse should be calculated, a
+                list of such matrices to invert in a single call, a
+                numpy.ndarray of shape (n, n) or (b, n, n), or a sparse
+                dict of keys mapping (row, column) to the non-zero values
+        exact: If True, invert list input with fractions.Fraction
+               arithmetic so that integer matrices get an exact inverse
+        method: 'elimination', or 'expansion' to divide the adjugate built
+                by exact cofactor expansion over a MinorCache by the
+                determinant (list and dict input only)
+        n: The size of a dict of keys matrix, by default one more than
+           its largest index
 
     Returns:
-        The inverse of matrix, or None if matrix is singular
+        The inverse of matrix, or None if matrix is singular. For a list
+        of matrices, a list holding the result for each matrix. For a
+        stacked numpy.ndarray, the stacked inverses, where singular
+        matrices are filled with nan
+        For a dict of keys matrix, a dict of keys of the inverse
 
     Raises:
         TypeError: If matrix is not a list of lists
         ValueError: If matrix is not square or is empty
     """
+    # NumPy arrays go through the batched LAPACK backend
+    if isinstance(matrix, np.ndarray):
+        check_ndarray(matrix, "matrix must be a non-empty square matrix",
+                      non_empty=True)
+        inverses = np_inverse(matrix)
+        if matrix.ndim == 2 and np.isnan(inverses).all():
+            return None
+        return inverses
+
+    # Invert each matrix of a batch
+    if is_batch(matrix):
+        return [inverse(item, exact, method) for item in matrix]
+
+    # Dict of keys matrices are inverted by structure, and only densified
+    # when they have none
+    if isinstance(matrix, dict):
+        n = check_dok(matrix, "matrix must be a non-empty square matrix", n)
+        if n == 0:
+            raise ValueError("matrix must be a non-empty square matrix")
+        rows = sparse_rows(matrix, n)
+        if method != 'expansion':
+            rows = structured_inverse(rows, exact)
+            if rows is None:
+                return None
+            if rows is not NotImplemented:
+                return {(i, j): value for i, row in enumerate(rows)
+                        for j, value in row.items()}
+        result = inverse(densify(sparse_rows(matrix, n)), exact, method)
+        if result is None:
+            return None
+        return {(i, j): value for i, row in enumerate(result)
+                for j, value in enumerate(row) if value != 0}
+
     # Check if matrix is a list
     if not isinstance(matrix, list):
         raise TypeError("matrix must be a list of lists")
@@ -39,103 +97,52 @@ def inverse(matrix):
         if len(row) != n:
             raise ValueError("matrix must be a non-empty square matrix")
 
-    # Calculate determinant
-    det = determinant(matrix)
-
-    # Check if matrix is singular (determinant = 0)
-    if det == 0:
-        return None
-
-    # Special case: 1x1 matrix
-    if n == 1:
-        return [[1.0 / matrix[0][0]]]
+    # Cofactor expansion shares every sub-minor between the determinant
+    # and the adjugate
+    if method == 'expansion':
+        if exact:
+            matrix = to_fractions(matrix)
+        cache = MinorCache(matrix)
+        det = cache.determinant()
+        if det == 0:
+            return None
+        return [[cache.cofactor(j, i) / det for j in range(n)]
+                for i in range(n)]
 
-    # Calculate adjugate matrix
-    adj_matrix = adjugate(matrix)
+    # Bareiss/Gauss-Jordan elimination, or substitution for structured
+    # matrices
+    return dense_inverse(matrix, exact)
 
-    # Calculate inverse: (1/det) * adjugate
-    inverse_matrix = []
-    for i in range(n):
-        inv_row = []
-        for j in range(n):
-            inv_row.append(adj_matrix[i][j] / det)
-        inverse_matrix.append(inv_row)
 
-    return inverse_matrix
-
-
-def adjugate(matrix):
+def is_batch(matrix):
     """
-    Calculates the adjugate matrix of a matrix
+    Checks whether matrix is a list of matrices rather than a matrix
     """
-    n = len(matrix)
-
-    # Special case: 1x1 matrix
-    if n == 1:
-        return [[1]]
+    return (isinstance(matrix, list) and len(matrix) > 0 and
+            isinstance(matrix[0], list) and len(matrix[0]) > 0 and
+            isinstance(matrix[0][0], list))
 
-    # Calculate cofactor matrix first
-    cofactor_matrix = []
 
-    for i in range(n):
-        cofactor_row = []
-        for j in range(n):
-            # Create submatrix by removing row i and column j
-            submatrix = []
-            for row_idx in range(n):
-                if row_idx != i:
-                    sub_row = []
-                    for col_idx in range(n):
-                        if col_idx != j:
-                            sub_row.append(matrix[row_idx][col_idx])
-                    submatrix.append(sub_row)
-
-            # Calculate determinant of submatrix (minor)
-            minor_det = determinant(submatrix)
-
-            # Apply the cofactor sign: (-1)^(i+j)
-            cofactor_value = ((-1) ** (i + j)) * minor_det
-            cofactor_row.append(cofactor_value)
+def np_inverse(matrices):
+    """
+    Inverts a (n, n) or stacked (b, n, n) numpy.ndarray with one
+    vectorized LAPACK call
 
-        cofactor_matrix.append(cofactor_row)
+    Matrices whose smallest singular value is negligible next to their
+    largest are singular and come back filled with nan
 
-    # Calculate adjugate matrix by transposing the cofactor matrix
-    adjugate_matrix = []
-    for j in range(n):
-        adj_row = []
-        for i in range(n):
-            adj_row.append(cofactor_matrix[i][j])
-        adjugate_matrix.append(adj_row)
+    Args:
+        matrices: A numpy.ndarray of non-empty square matrices
 
-    return adjugate_matrix
+    Returns:
+        A numpy.ndarray of the same shape holding the inverses
+    """
+    matrices = matrices.astype(float)
+    n = matrices.shape[-1]
+    s = np.linalg.svd(matrices, compute_uv=False)
+    singular = s[..., -1] <= n * sys.float_info.epsilon * s[..., 0]
 
+    inverses = np.full(matrices.shape, np.nan)
+    inverses[~singular] = np.linalg.inv(matrices[~singular])
 
-def determinant(matrix):
-    """
-    Helper function to calculate determinant
-    """
-    # Handle 1x1 matrix
-    if len(matrix) == 1:
-        return matrix[0][0]
-
-    # Handle 2x2 matrix
-    if len(matrix) == 2:
-        return matrix[0][0] * matrix[1][1] - matrix[0][1] * matrix[1][0]
-
-    # Recursive case for larger matrices
-    det = 0
-    for col in range(len(matrix)):
-        # Create minor matrix
-        minor = []
-        for row in range(1, len(matrix)):
-            minor_row = []
-            for c in range(len(matrix)):
-                if c != col:
-                    minor_row.append(matrix[row][c])
-            minor.append(minor_row)
-
-        # Calculate cofactor
-        cofactor = ((-1) ** col) * matrix[0][col] * determinant(minor)
-        det += cofactor
-
-    return det
+    return inverses
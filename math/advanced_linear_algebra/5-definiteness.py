@@ -5,6 +5,9 @@ Module for calculating matrix definiteness
 
 import numpy as np
 
+LABELS = [None, "Positive definite", "Positive semi-definite",
+          "Negative definite", "Negative semi-definite", "Indefinite"]
+
 
 def definiteness(matrix):
     """
@@ -12,7 +15,7 @@ def definiteness(matrix):
 
     Args:
         matrix: A numpy.ndarray of shape (n, n) whose definiteness should be
-                calculated
+                calculated, or a stack of shape (b, n, n) of such matrices
 
     Returns:
         String indicating the definiteness of the matrix:
@@ -22,6 +25,7 @@ def definiteness(matrix):
         - "Negative definite"
         - "Indefinite"
         - None if matrix is not valid
+        For a stack of matrices, a list with one such value per matrix
 
     Raises:
         TypeError: If matrix is not a numpy.ndarray
@@ -34,45 +38,111 @@ def definiteness(matrix):
     if matrix.size == 0:
         return None
 
-    # Check if matrix is 2D
-    if matrix.ndim != 2:
+    # Check if matrix is 2D, or a 3D stack of matrices
+    if matrix.ndim not in (2, 3):
         return None
 
     # Check if matrix is square
-    if matrix.shape[0] != matrix.shape[1]:
+    if matrix.shape[-1] != matrix.shape[-2]:
         return None
 
-    # Check if matrix is symmetric (required for definiteness)
-    if not np.allclose(matrix, matrix.T):
-        return None
+    if matrix.ndim == 3:
+        return stack_definiteness(matrix)
+
+    return stack_definiteness(matrix[np.newaxis])[0]
+
+
+def stack_definiteness(matrices):
+    """
+    Calculates the definiteness of every matrix in a (b, n, n) stack
+
+    A Cholesky factorization settles the common positive definite case
+    without any eigenvalues. It is tried on the whole stack first, then
+    matrix by matrix with cholesky_mask if any matrix fails, so only the
+    matrices without a factor go through the symmetric eigensolver
+
+    Args:
+        matrices: A numpy.ndarray of shape (b, n, n)
 
-    # Calculate eigenvalues
+    Returns:
+        A list with the definiteness of each matrix
+    """
+    b, n, _ = matrices.shape
+    tolerance = 1e-8
+    labels = [None] * b
+
+    # Check which matrices are symmetric (required for definiteness)
+    symmetric = np.isclose(matrices, np.swapaxes(matrices, 1, 2)).all(
+        axis=(1, 2))
+    index = np.flatnonzero(symmetric)
+    if len(index) == 0:
+        return labels
+    candidates = matrices[index]
+
+    # A - tolerance * I has a Cholesky factor exactly when every
+    # eigenvalue of A is above tolerance
+    shifted = candidates - tolerance * np.eye(n)
     try:
-        eigenvalues = np.linalg.eigvals(matrix)
+        np.linalg.cholesky(shifted)
     except np.linalg.LinAlgError:
-        return None
+        definite = cholesky_mask(shifted)
+    else:
+        definite = np.ones(len(index), dtype=bool)
 
-    # Remove very small values (numerical errors)
-    eigenvalues = eigenvalues.real
-    tolerance = 1e-8
+    for i in index[definite]:
+        labels[i] = LABELS[1]
+    index = index[~definite]
+    if len(index) == 0:
+        return labels
 
-    # Count positive, negative, and zero eigenvalues
-    positive_count = np.sum(eigenvalues > tolerance)
-    negative_count = np.sum(eigenvalues < -tolerance)
-    zero_count = np.sum(np.abs(eigenvalues) <= tolerance)
+    # Calculate eigenvalues of the remaining matrices
+    try:
+        eigenvalues = np.linalg.eigvalsh(candidates[~definite])
+    except np.linalg.LinAlgError:
+        return labels
 
-    n = len(eigenvalues)
+    # Count positive, negative, and zero eigenvalues
+    positive_count = np.sum(eigenvalues > tolerance, axis=1)
+    negative_count = np.sum(eigenvalues < -tolerance, axis=1)
+    zero_count = n - positive_count - negative_count
 
     # Determine definiteness based on eigenvalues
-    if positive_count == n:
-        return "Positive definite"
-    elif positive_count + zero_count == n and zero_count > 0:
-        return "Positive semi-definite"
-    elif negative_count == n:
-        return "Negative definite"
-    elif negative_count + zero_count == n and zero_count > 0:
-        return "Negative semi-definite"
-    elif positive_count > 0 and negative_count > 0:
-        return "Indefinite"
-    else:
-        return None
+    codes = np.select([positive_count == n,
+                       (negative_count == 0) & (zero_count > 0),
+                       negative_count == n,
+                       (positive_count == 0) & (zero_count > 0),
+                       (positive_count > 0) & (negative_count > 0)],
+                      [1, 2, 3, 4, 5], 0)
+    for i, code in zip(index, codes):
+        labels[i] = LABELS[code]
+
+    return labels
+
+
+def cholesky_mask(matrices):
+    """
+    Runs a Cholesky factorization of every matrix in a (b, n, n) stack at
+    once, vectorized over the stack
+
+    Args:
+        matrices: A numpy.ndarray of symmetric matrices
+
+    Returns:
+        A boolean numpy.ndarray of shape (b,), True where the matrix has a
+        Cholesky factor, i.e. is positive definite
+    """
+    b, n, _ = matrices.shape
+    remaining = matrices.astype(float)
+    definite = np.ones(b, dtype=bool)
+
+    # Right-looking elimination on the trailing submatrix; failed matrices
+    # continue with a unit pivot so the rest of the stack is unaffected
+    for j in range(n):
+        pivot = remaining[:, j, j]
+        positive = pivot > 0
+        definite &= positive
+        root = np.sqrt(np.where(positive, pivot, 1))
+        column = remaining[:, j + 1:, j] / root[:, None]
+        remaining[:, j + 1:, j + 1:] -= column[:, :, None] * column[:, None, :]
+
+    return definite
@@ -0,0 +1,935 @@
+#!/usr/bin/env python3
+"""
+Elimination engine shared by the advanced linear algebra functions
+
+Dense list of lists matrices are reduced by Bareiss, LU or Gauss-Jordan
+elimination, sparse ones on dicts of their non-zero entries, and exact
+cofactor expansion runs over a MinorCache
+"""
+
+from collections import OrderedDict
+from fractions import Fraction
+from functools import reduce
+from math import gcd
+from numbers import Rational
+import sys
+import numpy as np
+
+
+def check_ndarray(matrix, message, non_empty=False):
+    """
+    Validates a numpy.ndarray of shape (n, n) or (b, n, n) with the same
+    errors as the list of lists API
+
+    Args:
+        matrix: The numpy.ndarray to validate
+        message: The ValueError message used when matrix is not square
+        non_empty: If True, 0x0 matrices are rejected as well
+
+    Raises:
+        TypeError: If matrix is not 2D or 3D
+        ValueError: If the matrices are not square (or are empty)
+    """
+    if matrix.ndim not in (2, 3):
+        raise TypeError("matrix must be a list of lists")
+    if matrix.shape[-1] != matrix.shape[-2]:
+        raise ValueError(message)
+    if non_empty and matrix.shape[-1] == 0:
+        raise ValueError(message)
+
+
+def dense_determinant(matrix):
+    """
+    Calculates the determinant of a non-empty square list of lists by
+    O(n^3) elimination
+
+    Args:
+        matrix: A non-empty square list of lists of numbers
+
+    Returns:
+        The determinant of the matrix, an exact int for integer input
+    """
+    n = len(matrix)
+
+    # Base case: 1x1 matrix
+    if n == 1:
+        return matrix[0][0]
+
+    # Base case: 2x2 matrix
+    if n == 2:
+        return matrix[0][0] * matrix[1][1] - matrix[0][1] * matrix[1][0]
+
+    # Triangular and block-diagonal matrices skip the full elimination
+    det = structured_determinant(sparse_rows(matrix))
+    if det is not None:
+        return det
+
+    # Integer matrices keep an exact integer result through Bareiss
+    # elimination, everything else goes through partial-pivoting LU
+    if all(isinstance(value, int) for row in matrix for value in row):
+        return bareiss_determinant(matrix)
+
+    return lu_determinant(matrix)
+
+
+def bareiss_determinant(matrix):
+    """
+    Calculates the determinant of an integer matrix with fraction-free
+    Bareiss elimination
+
+    Every intermediate division is exact, so the result is the exact
+    integer determinant in O(n^3) operations
+
+    Args:
+        matrix: A non-empty square list of lists of integers
+
+    Returns:
+        The determinant of the matrix as an int
+    """
+    n = len(matrix)
+    work = [row[:] for row in matrix]
+    sign = 1
+    previous = 1
+
+    for k in range(n - 1):
+        # Swap in a row with a non-zero pivot if needed
+        if work[k][k] == 0:
+            for i in range(k + 1, n):
+                if work[i][k] != 0:
+                    work[k], work[i] = work[i], work[k]
+                    sign = -sign
+                    break
+            else:
+                return 0
+
+        pivot = work[k][k]
+        pivot_row = work[k]
+        for i in range(k + 1, n):
+            row = work[i]
+            factor = row[k]
+            for j in range(k + 1, n):
+                row[j] = (row[j] * pivot - factor * pivot_row[j]) // previous
+        previous = pivot
+
+    return sign * work[n - 1][n - 1]
+
+
+def lu_determinant(matrix):
+    """
+    Calculates the determinant of a matrix with partial-pivoting LU
+    (Gaussian elimination) in O(n^3) operations
+
+    Args:
+        matrix: A non-empty square list of lists of numbers
+
+    Returns:
+        The determinant of the matrix
+    """
+    n = len(matrix)
+    work = [row[:] for row in matrix]
+    det = 1
+
+    for k in range(n):
+        # Pick the largest remaining entry in column k as the pivot
+        p = max(range(k, n), key=lambda i: abs(work[i][k]))
+        if work[p][k] == 0:
+            # Column is all zeros below the diagonal: matrix is singular
+            return work[p][k]
+        if p != k:
+            work[k], work[p] = work[p], work[k]
+            det = -det
+
+        pivot = work[k][k]
+        pivot_row = work[k]
+        det *= pivot
+        for i in range(k + 1, n):
+            row = work[i]
+            factor = row[k] / pivot
+            if factor == 0:
+                continue
+            for j in range(k + 1, n):
+                row[j] -= factor * pivot_row[j]
+
+    return det
+
+
+def bareiss_adjugate(matrix):
+    """
+    Calculates the adjugate of an integer matrix with fraction-free
+    Gauss-Jordan elimination on [matrix | I]
+
+    Args:
+        matrix: A non-empty square list of lists of integers
+
+    Returns:
+        A tuple (det, adjugate) with the exact integer determinant and
+        adjugate, or None if matrix is singular
+    """
+    n = len(matrix)
+    work = [row[:] + [1 if j == i else 0 for j in range(n)]
+            for i, row in enumerate(matrix)]
+    sign = 1
+    previous = 1
+
+    for k in range(n):
+        # Swap in a row with a non-zero pivot if needed
+        if work[k][k] == 0:
+            for i in range(k + 1, n):
+                if work[i][k] != 0:
+                    work[k], work[i] = work[i], work[k]
+                    sign = -sign
+                    break
+            else:
+                return None
+
+        pivot = work[k][k]
+        pivot_row = work[k]
+        for i in range(n):
+            if i == k:
+                continue
+            row = work[i]
+            factor = row[k]
+            for j in range(k + 1, 2 * n):
+                row[j] = (row[j] * pivot - factor * pivot_row[j]) // previous
+        previous = pivot
+
+    # The right block is now det(PA) * inverse(A), with P the row swaps
+    adjugate = [[sign * value for value in row[n:]] for row in work]
+
+    return sign * previous, adjugate
+
+
+def gauss_jordan(matrix, tol=0):
+    """
+    Inverts a matrix by reducing [matrix | I] with partial-pivoting
+    Gauss-Jordan elimination
+
+    Args:
+        matrix: A non-empty square list of lists of numbers
+        tol: Pivots whose absolute value is not above tol are treated as
+             zero
+
+    Returns:
+        A tuple (det, inverse), or None if matrix is singular
+    """
+    n = len(matrix)
+    work = [list(row) + [1 if j == i else 0 for j in range(n)]
+            for i, row in enumerate(matrix)]
+    det = 1
+
+    for k in range(n):
+        # Pick the largest remaining entry in column k as the pivot
+        p = max(range(k, n), key=lambda i: abs(work[i][k]))
+        if abs(work[p][k]) <= tol:
+            return None
+        if p != k:
+            work[k], work[p] = work[p], work[k]
+            det = -det
+
+        pivot = work[k][k]
+        det *= pivot
+        pivot_row = [value / pivot for value in work[k]]
+        work[k] = pivot_row
+        for i in range(n):
+            factor = work[i][k]
+            if i != k and factor != 0:
+                work[i] = [a - factor * b for a, b in zip(work[i], pivot_row)]
+
+    return det, [row[n:] for row in work]
+
+
+def null_vector(matrix, tol=0):
+    """
+    Calculates the rank of a matrix and a vector in its null space
+
+    Integer matrices are reduced fraction-free, dividing each row by the
+    gcd of its entries to keep them small
+
+    Args:
+        matrix: A non-empty square list of lists of numbers
+        tol: Pivots whose absolute value is not above tol are treated as
+             zero
+
+    Returns:
+        A tuple (rank, vector) where vector is a non-zero x with
+        matrix * x = 0, or None if matrix has full rank
+    """
+    n = len(matrix)
+    integer = all(isinstance(value, int) for row in matrix for value in row)
+    work = [list(row) for row in matrix]
+    pivots = []
+
+    for c in range(n):
+        r = len(pivots)
+        if r == n:
+            break
+
+        # Pick the largest remaining entry in column c as the pivot
+        p = max(range(r, n), key=lambda i: abs(work[i][c]))
+        if abs(work[p][c]) <= tol:
+            continue
+        work[r], work[p] = work[p], work[r]
+
+        pivot_row = work[r]
+        pivot = pivot_row[c]
+        if not integer:
+            pivot_row = [value / pivot for value in pivot_row]
+            work[r] = pivot_row
+        for i in range(n):
+            factor = work[i][c]
+            if i == r or factor == 0:
+                continue
+            if integer:
+                row = [pivot * a - factor * b
+                       for a, b in zip(work[i], pivot_row)]
+                divisor = reduce(gcd, row)
+                if divisor > 1:
+                    row = [value // divisor for value in row]
+            else:
+                row = [a - factor * b for a, b in zip(work[i], pivot_row)]
+            work[i] = row
+        pivots.append(c)
+
+    rank = len(pivots)
+    if rank == n:
+        return rank, None
+
+    # Back-substitute the first free column with every other free one at 0
+    free = next(c for c in range(n) if c not in pivots)
+    vector = [0] * n
+    vector[free] = 1
+    for r, c in enumerate(pivots):
+        if integer:
+            vector[c] = Fraction(-work[r][free], work[r][c])
+        else:
+            vector[c] = -work[r][free]
+
+    return rank, vector
+
+
+def singular_tolerance(matrix):
+    """
+    Calculates the pivot size below which a float matrix is treated as
+    numerically singular
+    """
+    scale = max(abs(value) for row in matrix for value in row)
+    return len(matrix) * sys.float_info.epsilon * scale
+
+
+def to_fractions(matrix):
+    """
+    Converts a matrix of rationals to Fractions so elimination stays exact
+    """
+    return [[Fraction(value) for value in row] for row in matrix]
+
+
+def cofactor_matrix(matrix, method='elimination'):
+    """
+    Calculates every cofactor of a matrix from a single elimination
+    instead of one determinant per entry
+
+    Non-singular matrices use cofactor = det * inverse^T. Singular (or,
+    for floats, numerically singular) matrices fall back to
+    rank_deficient_adjugate
+
+    Args:
+        matrix: A square list of lists of numbers with at least 2 rows
+        method: 'elimination', or 'expansion' to expand every cofactor
+                exactly over one shared MinorCache
+
+    Returns:
+        The cofactor matrix of the input matrix
+    """
+    n = len(matrix)
+    if method == 'expansion':
+        cache = MinorCache(matrix)
+        return [[cache.cofactor(i, j) for j in range(n)] for i in range(n)]
+
+    integer = all(isinstance(value, int) for row in matrix for value in row)
+    exact = all(isinstance(value, Rational) for row in matrix
+                for value in row)
+
+    adjugate = None
+    if integer:
+        # Fraction-free elimination gives the integer adjugate directly
+        result = bareiss_adjugate(matrix)
+        if result is not None:
+            adjugate = result[1]
+    elif exact:
+        result = gauss_jordan(to_fractions(matrix))
+        if result is not None:
+            det, inverse = result
+            adjugate = [[det * value for value in row] for row in inverse]
+    else:
+        result = gauss_jordan(matrix, singular_tolerance(matrix))
+        if result is not None:
+            det, inverse = result
+            adjugate = [[det * value for value in row] for row in inverse]
+
+    if adjugate is None:
+        adjugate = rank_deficient_adjugate(matrix)
+
+    # The cofactor matrix is the transpose of the adjugate
+    return [[adjugate[j][i] for j in range(n)] for i in range(n)]
+
+
+def rank_deficient_adjugate(matrix):
+    """
+    Calculates the adjugate of a singular matrix
+
+    A matrix of rank n - 2 or less has an all-zero adjugate. A matrix of
+    rank n - 1 has adjugate alpha * x * y^T, where x and y span its right
+    and left null spaces, so only one cofactor has to be evaluated
+    directly to find alpha. Float matrices take both null spaces, and the
+    rank, from a single SVD so the two can never disagree
+
+    Args:
+        matrix: A singular square list of lists of numbers with at least
+                2 rows
+
+    Returns:
+        The adjugate matrix of the input matrix
+    """
+    n = len(matrix)
+    integer = all(isinstance(value, int) for row in matrix for value in row)
+    exact = all(isinstance(value, Rational) for row in matrix
+                for value in row)
+
+    if not exact:
+        u, s, vt = np.linalg.svd(np.array(matrix, dtype=float))
+        if s[-2] <= n * sys.float_info.epsilon * s[0]:
+            return [[0.0] * n for _ in range(n)]
+        return svd_adjugate(u, s, vt).tolist()
+
+    if not integer:
+        matrix = to_fractions(matrix)
+    transpose = [[matrix[j][i] for j in range(n)] for i in range(n)]
+
+    rank, x = null_vector(matrix)
+    _, y = null_vector(transpose)
+    if rank < n - 1:
+        return [[0] * n for _ in range(n)]
+    if x is None or y is None:
+        # The eliminations disagree on the rank, so evaluate every entry
+        return [[direct_cofactor(matrix, j, i) for j in range(n)]
+                for i in range(n)]
+
+    # Evaluate the best-conditioned entry adj[i][j] = C[j][i] directly
+    i = max(range(n), key=lambda k: abs(x[k]))
+    j = max(range(n), key=lambda k: abs(y[k]))
+    # Alpha stays a Fraction so the integer adjugate is exact
+    alpha = Fraction(direct_cofactor(matrix, j, i)) / (x[i] * y[j])
+
+    adjugate = [[alpha * x[r] * y[c] for c in range(n)] for r in range(n)]
+    if integer:
+        adjugate = [[int(value) for value in row] for row in adjugate]
+
+    return adjugate
+
+
+def direct_cofactor(matrix, i, j):
+    """
+    Calculates the (i, j) cofactor of a matrix from the determinant of
+    its minor
+    """
+    n = len(matrix)
+    submatrix = [[matrix[r][c] for c in range(n) if c != j]
+                 for r in range(n) if r != i]
+    entry = dense_determinant(submatrix)
+    if (i + j) % 2 == 1:
+        return -entry
+    return entry
+
+
+def np_cofactor_matrix(matrices):
+    """
+    Calculates the cofactor matrices of a (n, n) or stacked (b, n, n)
+    numpy.ndarray with vectorized LAPACK calls
+
+    Args:
+        matrices: A numpy.ndarray of non-empty square matrices
+
+    Returns:
+        A numpy.ndarray of the same shape holding the cofactor matrices
+    """
+    u, s, vt = np.linalg.svd(matrices.astype(float))
+    return np.swapaxes(svd_adjugate(u, s, vt), -1, -2)
+
+
+def svd_adjugate(u, s, vt):
+    """
+    Calculates adjugates from the SVDs A = U * diag(s) * V^T
+
+    The adjugate is
+    det(U) * det(V) * V * diag(product of the other singular values) * U^T,
+    which stays well defined for singular matrices
+
+    Args:
+        u: numpy.ndarray of shape (..., n, n) of the left singular vectors
+        s: numpy.ndarray of shape (..., n) of the singular values
+        vt: numpy.ndarray of shape (..., n, n) of the transposed right
+            singular vectors
+
+    Returns:
+        A numpy.ndarray of shape (..., n, n) holding the adjugates
+    """
+    # Product of all singular values except the i-th, without dividing
+    ones = np.ones(s.shape[:-1] + (1,))
+    before = np.cumprod(np.concatenate([ones, s[..., :-1]], axis=-1), axis=-1)
+    after = np.cumprod(np.concatenate([ones, s[..., :0:-1]], axis=-1),
+                       axis=-1)[..., ::-1]
+    others = before * after
+
+    sign = np.linalg.det(u) * np.linalg.det(vt)
+    adjugate = np.matmul(np.swapaxes(vt, -1, -2) * others[..., None, :],
+                         np.swapaxes(u, -1, -2))
+    adjugate *= sign[..., None, None]
+
+    return adjugate
+
+
+def dense_inverse(matrix, exact=False):
+    """
+    Inverts a non-empty square list of lists by elimination
+
+    Args:
+        matrix: A non-empty square list of lists of numbers
+        exact: If True, return fractions.Fraction values so that integer
+               matrices get an exact inverse
+
+    Returns:
+        The inverse of matrix, or None if matrix is singular
+    """
+    n = len(matrix)
+
+    # Triangular and block-diagonal matrices skip the full elimination
+    rows = structured_inverse(sparse_rows(matrix), exact)
+    if rows is None:
+        return None
+    if rows is not NotImplemented:
+        zero = Fraction(0) if exact else 0.0
+        return [[row.get(j, zero) for j in range(n)] for row in rows]
+
+    # Integer matrices get an exact adjugate and determinant from
+    # fraction-free elimination, so only the final division rounds
+    if all(isinstance(value, int) for row in matrix for value in row):
+        result = bareiss_adjugate(matrix)
+        if result is None:
+            return None
+        det, adjugate = result
+        if exact:
+            return [[Fraction(value, det) for value in row]
+                    for row in adjugate]
+        return [[value / det for value in row] for row in adjugate]
+
+    # Otherwise reduce [matrix | I] to [I | inverse]; a pivot that
+    # vanishes (within rounding for floats) means the matrix is singular
+    if exact:
+        result = gauss_jordan(to_fractions(matrix))
+    else:
+        result = gauss_jordan(matrix, singular_tolerance(matrix))
+
+    if result is None:
+        return None
+
+    return result[1]
+
+
+class MinorCache:
+    """
+    Memoizes the determinants of the minors of one matrix for exact
+    cofactor expansion
+
+    A minor is keyed by the bitmasks of the rows and columns removed from
+    the matrix, so sibling branches of the expansion share sub-minors
+    instead of recomputing them. This takes the expansion from O(n!) to
+    O(n * 2^n) steps while keeping the order of operations of the
+    recursive expansion along the first row
+    """
+
+    def __init__(self, matrix, maxsize=1 << 20):
+        """
+        Class constructor
+
+        Args:
+            matrix: A non-empty square list of lists of numbers
+            maxsize: The number of minors kept before the least recently
+                     used ones are evicted
+        """
+        self.matrix = matrix
+        self.n = len(matrix)
+        self.maxsize = maxsize
+        self.cache = OrderedDict()
+
+    def determinant(self, rows=0, columns=0):
+        """
+        Calculates the determinant of a minor by cofactor expansion along
+        its first row
+
+        Args:
+            rows: Bitmask of the rows removed from the matrix
+            columns: Bitmask of the columns removed from the matrix
+
+        Returns:
+            The determinant of the remaining submatrix
+        """
+        key = (rows, columns)
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+
+        remaining = [c for c in range(self.n) if not columns >> c & 1]
+        if len(remaining) == 0:
+            return 1
+        row = next(r for r in range(self.n) if not rows >> r & 1)
+        if len(remaining) == 1:
+            return self.matrix[row][remaining[0]]
+
+        det = 0
+        for k, col in enumerate(remaining):
+            det += ((-1) ** k * self.matrix[row][col] *
+                    self.determinant(rows | 1 << row, columns | 1 << col))
+
+        self.cache[key] = det
+        if len(self.cache) > self.maxsize:
+            self.cache.popitem(last=False)
+
+        return det
+
+    def cofactor(self, i, j):
+        """
+        Calculates the (i, j) cofactor of the matrix
+
+        Args:
+            i: Row index
+            j: Column index
+
+        Returns:
+            (-1)^(i+j) times the minor with row i and column j removed
+        """
+        return (-1) ** (i + j) * self.determinant(1 << i, 1 << j)
+
+
+def check_dok(matrix, message, n=None):
+    """
+    Validates a dict of keys matrix mapping (row, column) to values
+
+    Args:
+        matrix: The dict to validate
+        message: The ValueError message used when an index falls outside
+                 the n x n matrix
+        n: The size of the matrix, by default one more than its largest
+           index
+
+    Returns:
+        The size n of the matrix
+
+    Raises:
+        TypeError: If a key is not a (row, column) tuple of ints
+        ValueError: If an index falls outside the n x n matrix
+    """
+    for key in matrix:
+        if (not isinstance(key, tuple) or len(key) != 2 or
+                not all(isinstance(index, int) for index in key)):
+            raise TypeError("matrix keys must be (row, column) tuples")
+
+    if n is None:
+        n = 1 + max((max(key) for key in matrix), default=-1)
+
+    for i, j in matrix:
+        if not 0 <= i < n or not 0 <= j < n:
+            raise ValueError(message)
+
+    return n
+
+
+def sparse_rows(matrix, n=None):
+    """
+    Converts a list of lists or a dict of keys matrix to a list holding a
+    {column: value} dict of the non-zero entries of each row
+
+    Args:
+        matrix: A square list of lists, or a dict of keys matrix
+        n: The size of a dict of keys matrix
+
+    Returns:
+        The list of row dicts
+    """
+    if isinstance(matrix, dict):
+        rows = [{} for _ in range(n)]
+        for (i, j), value in matrix.items():
+            if value != 0:
+                rows[i][j] = value
+        return rows
+
+    return [{j: value for j, value in enumerate(row) if value != 0}
+            for row in matrix]
+
+
+def densify(rows):
+    """
+    Converts a list of {column: value} row dicts back to a list of lists
+    """
+    n = len(rows)
+    return [[row.get(j, 0) for j in range(n)] for row in rows]
+
+
+def triangle(rows):
+    """
+    Detects whether a matrix is triangular
+
+    Args:
+        rows: A list of {column: value} dicts of the non-zero entries
+
+    Returns:
+        'diagonal', 'upper', 'lower' or None
+    """
+    upper = all(min(row, default=i) >= i for i, row in enumerate(rows))
+    lower = all(max(row, default=i) <= i for i, row in enumerate(rows))
+
+    if upper and lower:
+        return 'diagonal'
+    if upper:
+        return 'upper'
+    if lower:
+        return 'lower'
+    return None
+
+
+def diagonal_blocks(rows):
+    """
+    Splits a matrix into its finest block-diagonal structure
+
+    The matrix splits before index k when the rows above k only reach
+    columns below k and the rows from k on only reach columns from k on
+
+    Args:
+        rows: A list of {column: value} dicts of the non-zero entries
+
+    Returns:
+        A list of (start, stop) index ranges, one per diagonal block
+    """
+    n = len(rows)
+
+    # Leftmost column reached by any row from i on
+    lowest = [n] * (n + 1)
+    for i in range(n - 1, -1, -1):
+        lowest[i] = min(lowest[i + 1], min(rows[i], default=n))
+
+    blocks = []
+    start = 0
+    reach = -1
+    for k in range(1, n):
+        reach = max(reach, max(rows[k - 1], default=-1))
+        if reach < k and lowest[k] >= k:
+            blocks.append((start, k))
+            start = k
+    blocks.append((start, n))
+
+    return blocks
+
+
+def structured_determinant(rows):
+    """
+    Calculates the determinant of a triangular or block-diagonal matrix
+
+    Args:
+        rows: A list of {column: value} dicts of the non-zero entries
+
+    Returns:
+        The product of the diagonal for a triangular matrix, the product
+        of the block determinants for a block-diagonal one, or None if
+        the matrix has neither structure
+    """
+    if triangle(rows) is not None:
+        det = 1
+        for i, row in enumerate(rows):
+            det *= row.get(i, 0)
+        return det
+
+    blocks = diagonal_blocks(rows)
+    if len(blocks) == 1:
+        return None
+
+    det = 1
+    for start, stop in blocks:
+        block = [[rows[i].get(j, 0) for j in range(start, stop)]
+                 for i in range(start, stop)]
+        det *= dense_determinant(block)
+
+    return det
+
+
+def sparse_determinant(rows):
+    """
+    Calculates the determinant of a sparse matrix with partial-pivoting
+    Gaussian elimination on its row dicts, so only non-zero entries and
+    fill-in are ever stored
+
+    Rational matrices are reduced with fractions.Fraction and keep an
+    exact result
+
+    Args:
+        rows: A list of {column: value} dicts of the non-zero entries
+
+    Returns:
+        The determinant of the matrix
+    """
+    n = len(rows)
+    integer = all(isinstance(value, int) for row in rows
+                  for value in row.values())
+    exact = all(isinstance(value, Rational) for row in rows
+                for value in row.values())
+    if exact:
+        work = [{j: Fraction(value) for j, value in row.items()}
+                for row in rows]
+    else:
+        work = [dict(row) for row in rows]
+
+    # Rows still holding a non-zero entry in each column
+    columns = [set() for _ in range(n)]
+    for i, row in enumerate(work):
+        for j in row:
+            columns[j].add(i)
+
+    det = 1
+    order = []
+    for k in range(n):
+        if not columns[k]:
+            return 0
+
+        # Pick the largest entry in column k as the pivot
+        p = max(columns[k], key=lambda i: abs(work[i][k]))
+        pivot_row = work[p]
+        pivot = pivot_row[k]
+        det *= pivot
+        order.append(p)
+        for j in pivot_row:
+            columns[j].discard(p)
+
+        for i in list(columns[k]):
+            row = work[i]
+            factor = row.pop(k) / pivot
+            columns[k].discard(i)
+            for j, value in pivot_row.items():
+                if j == k:
+                    continue
+                new = row.get(j, 0) - factor * value
+                if new == 0:
+                    row.pop(j, None)
+                    columns[j].discard(i)
+                else:
+                    row[j] = new
+                    columns[j].add(i)
+
+    # Pivoting row order[k] into position k permutes the rows
+    visited = [False] * n
+    for start in range(n):
+        if visited[start]:
+            continue
+        length = 0
+        i = start
+        while not visited[i]:
+            visited[i] = True
+            i = order[i]
+            length += 1
+        if length % 2 == 0:
+            det = -det
+
+    if integer:
+        return int(det)
+
+    return det
+
+
+def structured_inverse(rows, exact=False):
+    """
+    Inverts a triangular or block-diagonal matrix without a full
+    elimination
+
+    Args:
+        rows: A list of {column: value} dicts of the non-zero entries
+        exact: If True, return fractions.Fraction values
+
+    Returns:
+        A list of {column: value} dicts of the non-zero entries of the
+        inverse, None if the matrix is singular, or NotImplemented if it
+        has neither structure
+    """
+    kind = triangle(rows)
+    if kind is not None:
+        return triangular_inverse(rows, kind, exact)
+
+    blocks = diagonal_blocks(rows)
+    if len(blocks) == 1:
+        return NotImplemented
+
+    # Invert each diagonal block on its own
+    result = []
+    for start, stop in blocks:
+        block = [[rows[i].get(j, 0) for j in range(start, stop)]
+                 for i in range(start, stop)]
+        block_inverse = dense_inverse(block, exact)
+        if block_inverse is None:
+            return None
+        for row in block_inverse:
+            result.append({start + j: value for j, value in enumerate(row)
+                           if value != 0})
+
+    return result
+
+
+def triangular_inverse(rows, kind, exact=False):
+    """
+    Inverts a triangular matrix by substitution over its sparse rows
+
+    Row i of the inverse X of an upper triangular U follows from the rows
+    below it: X_i = (e_i - sum over k > i of U[i][k] * X_k) / U[i][i].
+    Lower triangular matrices are solved from the top down instead
+
+    Args:
+        rows: A list of {column: value} dicts of the non-zero entries
+        kind: 'diagonal', 'upper' or 'lower', as given by triangle
+        exact: If True, return fractions.Fraction values
+
+    Returns:
+        A list of {column: value} dicts of the non-zero entries of the
+        inverse, or None if the matrix is singular
+    """
+    n = len(rows)
+    if any(i not in row for i, row in enumerate(rows)):
+        return None
+
+    # Rational matrices are solved exactly and rounded once at the end
+    rational = all(isinstance(value, Rational) for row in rows
+                   for value in row.values())
+    if rational or exact:
+        rows = [{j: Fraction(value) for j, value in row.items()}
+                for row in rows]
+    else:
+        tol = singular_tolerance([list(row.values()) for row in rows])
+        if any(abs(row[i]) <= tol for i, row in enumerate(rows)):
+            return None
+
+    if kind == 'lower':
+        order = range(n)
+    else:
+        order = range(n - 1, -1, -1)
+
+    result = [None] * n
+    for i in order:
+        pivot = rows[i][i]
+        total = {}
+        for k, value in rows[i].items():
+            if k != i:
+                for j, x in result[k].items():
+                    total[j] = total.get(j, 0) - value * x
+        row = {j: value / pivot for j, value in total.items() if value != 0}
+        row[i] = 1 / pivot
+        result[i] = row
+
+    if rational and not exact:
+        result = [{j: float(value) for j, value in row.items()}
+                  for row in result]
+
+    return result
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Regression tests for cofactors of singular matrices"""
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+cofactor = __import__('2-cofactor').cofactor
+minor = __import__('1-minor').minor
+adjugate = __import__('3-adjugate').adjugate
+
+
+def laplace(matrix):
+    """Exact determinant by cofactor expansion along the first row"""
+    if len(matrix) == 1:
+        return matrix[0][0]
+    return sum((-1) ** j * matrix[0][j] *
+               laplace([row[:j] + row[j + 1:] for row in matrix[1:]])
+               for j in range(len(matrix)))
+
+
+def expected_cofactors(matrix):
+    """Cofactor matrix by definition"""
+    n = len(matrix)
+    return [[(-1) ** (i + j) *
+             laplace([row[:j] + row[j + 1:]
+                      for r, row in enumerate(matrix) if r != i])
+             for j in range(n)] for i in range(n)]
+
+
+def rank_deficient(n, rng):
+    """Random integer n x n matrix of rank n - 1"""
+    left = [[rng.randint(-4, 4) for _ in range(n - 1)] for _ in range(n)]
+    right = [[rng.randint(-4, 4) for _ in range(n)] for _ in range(n - 1)]
+    return [[sum(left[i][k] * right[k][j] for k in range(n - 1))
+             for j in range(n)] for i in range(n)]
+
+
+class TestRankDeficientCofactors(unittest.TestCase):
+    """Integer matrices of rank n - 1 have exact integer cofactors"""
+
+    def test_reported_matrix(self):
+        """Matrix where alpha used to be truncated"""
+        matrix = [[-3, -9, 12, 3], [-6, -6, -8, -6], [7, -4, 2, -7],
+                  [12, 7, 0, -3]]
+        result = cofactor(matrix)
+        self.assertEqual(result, expected_cofactors(matrix))
+        self.assertTrue(all(type(value) is int
+                            for row in result for value in row))
+
+    def test_random_rank_deficient(self):
+        """Random rank n - 1 integer matrices match the definition"""
+        rng = random.Random(0)
+        for _ in range(3000):
+            matrix = rank_deficient(rng.randint(2, 5), rng)
+            self.assertEqual(cofactor(matrix), expected_cofactors(matrix),
+                             matrix)
+
+    def test_random_rank_deficient_minor(self):
+        """Minors of rank n - 1 integer matrices are exact too"""
+        rng = random.Random(1)
+        for _ in range(500):
+            matrix = rank_deficient(4, rng)
+            expected = [[(-1) ** (i + j) * value
+                         for j, value in enumerate(row)]
+                        for i, row in enumerate(expected_cofactors(matrix))]
+            self.assertEqual(minor(matrix), expected)
+
+
+class TestRankDeficientFloatCofactors(unittest.TestCase):
+    """Float matrices of rank n - 1 have non-zero cofactors"""
+
+    def assertClose(self, result, expected):
+        """Entry-wise comparison relative to the largest expected entry"""
+        scale = max(abs(value) for row in expected for value in row)
+        for result_row, expected_row in zip(result, expected):
+            for value, target in zip(result_row, expected_row):
+                self.assertAlmostEqual(value, target,
+                                       delta=1e-9 * max(scale, 1))
+
+    def test_reported_matrix(self):
+        """Matrix whose eliminations of A and A^T disagreed on the rank"""
+        matrix = [[17 / 7, 4 / 7, -2], [15 / 7, 6 / 7, -12 / 7],
+                  [4 / 7, 24 / 7, 0]]
+        expected = expected_cofactors(matrix)
+        self.assertClose(cofactor(matrix), expected)
+        self.assertClose(adjugate(matrix),
+                         [list(row) for row in zip(*expected)])
+        self.assertClose(minor(matrix),
+                         [[(-1) ** (i + j) * value
+                           for j, value in enumerate(row)]
+                          for i, row in enumerate(expected)])
+
+    def test_random_rank_deficient(self):
+        """Random rank n - 1 float matrices match the definition"""
+        rng = random.Random(2)
+        for _ in range(300):
+            n = rng.randint(2, 5)
+            matrix = [[value / 7 for value in row]
+                      for row in rank_deficient(n, rng)]
+            self.assertClose(cofactor(matrix), expected_cofactors(matrix))
+            left = [[rng.gauss(0, 1) for _ in range(n - 1)]
+                    for _ in range(n)]
+            right = [[rng.gauss(0, 1) for _ in range(n)]
+                     for _ in range(n - 1)]
+            matrix = [[sum(left[i][k] * right[k][j] for k in range(n - 1))
+                       for j in range(n)] for i in range(n)]
+            self.assertClose(cofactor(matrix), expected_cofactors(matrix))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,39 +3,78 @@
 
 
 import numpy as np
+log_binomial_coefficient = __import__(
+    'log_factorial').log_binomial_coefficient
 
 
-def binomial_coefficient(n, k):
-    """Custom binomial coefficient calculation"""
-    if k < 0 or k > n:
-        return 0
-    if k == 0 or k == n:
-        return 1
+def check_observations(x, n):
+    """Check that x and n are valid numbers of successes and trials
 
-    k = min(k, n - k)
-    result = 1
-    for i in range(1, k + 1):
-        result = result * (n - i + 1) // i
+    x and n are ints, or numpy.ndarrays of ints that broadcast together for
+    a batch of observations
 
-    return result
+    Returns:
+        x and n, broadcast against each other if either one is an array
+    """
+    if isinstance(x, np.ndarray) or isinstance(n, np.ndarray):
+        x, n = np.broadcast_arrays(np.asarray(x), np.asarray(n))
+        valid_n = n.dtype.kind in 'iu' and not np.any(n <= 0)
+        valid_x = x.dtype.kind in 'iu' and not np.any(x < 0)
+    else:
+        valid_n = isinstance(n, int) and n > 0
+        valid_x = isinstance(x, int) and x >= 0
 
-
-def likelihood(x, n, P):
-    """Check for valid input parameters"""
-    if not isinstance(n, int) or n <= 0:
+    if not valid_n:
         raise ValueError("n must be a positive integer")
-    if not isinstance(x, int) or x < 0:
+    if not valid_x:
         raise ValueError(
             "x must be an integer that is greater than or equal to 0")
-    if x > n:
+    if np.any(x > n):
         raise ValueError("x cannot be greater than n")
+
+    return x, n
+
+
+def log_likelihood(x, n, P):
+    """Log of the binomial pmf of x successes in n trials for each p in P
+
+    Working in log space keeps the result finite for large n, where
+    p**x * (1 - p)**(n - x) underflows to 0. Arrays of observations give
+    one row per observation, all sharing log(P) and log(1 - P)
+    """
+    x = np.asarray(x)[..., None]
+    failures = np.asarray(n)[..., None] - x
+    with np.errstate(divide='ignore'):
+        log_p = np.log(P)
+        log_q = np.log1p(-P)
+    zero_p = np.isinf(log_p)
+    zero_q = np.isinf(log_q)
+
+    log_values = x * np.where(zero_p, 0, log_p)
+    log_values += failures * np.where(zero_q, 0, log_q)
+    log_values += log_binomial_coefficient(n, x[..., 0])[..., None]
+
+    # p == 0 rules out any success and p == 1 rules out any failure
+    log_values[..., zero_p] = np.where(x > 0, -np.inf,
+                                       log_values[..., zero_p])
+    log_values[..., zero_q] = np.where(failures > 0, -np.inf,
+                                       log_values[..., zero_q])
+
+    return log_values
+
+
+def likelihood(x, n, P):
+    """Check for valid input parameters and calculate the likelihood of x
+    successes in n trials for each probability in P
+
+    x and n may be numpy.ndarrays of observations, giving one row of
+    likelihoods per observation
+    """
+    x, n = check_observations(x, n)
     if not isinstance(P, np.ndarray) or P.ndim != 1:
         raise TypeError("P must be a 1D numpy.ndarray")
-    if any(val < 0 or val > 1 for val in P):
+    if np.any((P < 0) | (P > 1)):
         raise ValueError("All values in P must be in the range [0, 1]")
 
-    # Calculate the likelihood in P using the custom binomial pmf
-    likelihoods = np.array([binomial_coefficient(
-        n, x) * p**x * (1 - p)**(n - x) for p in P])
-
-    return likelihoods
+    # Calculate the likelihood in P from the log binomial pmf
+    return np.exp(log_likelihood(x, n, P))
@@ -1,45 +1,38 @@
 #!/usr/bin/env python3
 """Bayesian Probability Intersection"""
 import numpy as np
+check_observations = __import__('0-likelihood').check_observations
+log_likelihood = __import__('0-likelihood').log_likelihood
 
 
-def binomial_coefficient(n, k):
-    """Custom binomial coefficient calculation"""
-    if k < 0 or k > n:
-        return 0
-    if k == 0 or k == n:
-        return 1
+def log_intersection(x, n, P, Pr):
+    """Check for valid input parameters and calculate the log of the
+    intersection for each probability in P"""
+    x, n = check_observations(x, n)
+    check_prior(P, Pr)
 
-    k = min(k, n - k)
-    result = 1
-    for i in range(1, k + 1):
-        result = result * (n - i + 1) // i
+    # Add the log prior to the log likelihood of each hypothesis in P
+    log_values = log_likelihood(x, n, P)
+    with np.errstate(divide='ignore'):
+        log_values += np.log(Pr)
 
-    return result
+    return log_values
 
 
-def intersection(x, n, P, Pr):
-    """Check for valid input parameters"""
-    if not isinstance(n, int) or n <= 0:
-        raise ValueError("n must be a positive integer")
-    if not isinstance(x, int) or x < 0:
-        raise ValueError(
-            "x must be an integer that is greater than or equal to 0")
-    if x > n:
-        raise ValueError("x cannot be greater than n")
+def check_prior(P, Pr):
+    """Check that P and Pr are valid hypotheses and prior beliefs"""
     if not isinstance(P, np.ndarray) or P.ndim != 1:
         raise TypeError("P must be a 1D numpy.ndarray")
     if not isinstance(Pr, np.ndarray) or Pr.ndim != 1 or Pr.shape != P.shape:
         raise TypeError("Pr must be a numpy.ndarray with the same shape as P")
-    if any(val < 0 or val > 1 for val in P):
+    if np.any((P < 0) | (P > 1)):
         raise ValueError("All values in P must be in the range [0, 1]")
-    if any(val < 0 or val > 1 for val in Pr):
+    if np.any((Pr < 0) | (Pr > 1)):
         raise ValueError("All values in Pr must be in the range [0, 1]")
     if not np.isclose(np.sum(Pr), 1):
         raise ValueError("Pr must sum to 1")
 
-    # Calculate the intersection in P and the corresponding prior beliefs in Pr
-    intersection_values = np.array([binomial_coefficient(
-        n, x) * p**x * (1 - p)**(n - x) * prior for p, prior in zip(P, Pr)])
 
-    return intersection_values
+def intersection(x, n, P, Pr):
+    """Calculate the intersection of the data with each hypothesis in P"""
+    return np.exp(log_intersection(x, n, P, Pr))
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Sequential Bayesian updates of a posterior over a hypothesis grid"""
+
+import numpy as np
+check_prior = __import__('1-intersection').check_prior
+check_observations = __import__('0-likelihood').check_observations
+logsumexp = __import__('2-marginal').logsumexp
+
+
+class BayesianUpdater:
+    """Class that folds binomial observations into a posterior one batch
+    at a time
+
+    The posterior is kept as normalized log probabilities over P, so each
+    update only adds the log likelihood of the new observations. The
+    binomial coefficient is the same for every hypothesis and cancels out
+    in the normalization, so it is never computed
+    """
+
+    def __init__(self, P, Pr):
+        """Class constructor
+
+        Args:
+            P: 1D numpy.ndarray of the hypothetical probabilities
+            Pr: 1D numpy.ndarray of the prior beliefs of P
+
+        Raises:
+            TypeError, ValueError: As posterior does for invalid P and Pr
+        """
+        check_prior(P, Pr)
+        self.P = P
+        with np.errstate(divide='ignore'):
+            log_p = np.log(P)
+            log_q = np.log1p(-P)
+            self.log_posterior = np.log(Pr) - np.log(np.sum(Pr))
+        self.zero_p = np.isinf(log_p)
+        self.zero_q = np.isinf(log_q)
+        self.log_p = np.where(self.zero_p, 0, log_p)
+        self.log_q = np.where(self.zero_q, 0, log_q)
+        self.successes = 0
+        self.trials = 0
+
+    def update(self, x, n):
+        """Folds x successes in n trials into the posterior
+
+        Args:
+            x: Number of successes, or a numpy.ndarray of them
+            n: Number of trials, or a numpy.ndarray of them
+        """
+        x, n = check_observations(x, n)
+        x = int(np.sum(x))
+        failures = int(np.sum(n)) - x
+
+        self.log_posterior += x * self.log_p + failures * self.log_q
+        # p == 0 rules out any success and p == 1 rules out any failure
+        if x > 0:
+            self.log_posterior[self.zero_p] = -np.inf
+        if failures > 0:
+            self.log_posterior[self.zero_q] = -np.inf
+        self.log_posterior -= logsumexp(self.log_posterior)
+
+        self.successes += x
+        self.trials += x + failures
+
+    def posterior(self):
+        """Returns the current posterior over P"""
+        return np.exp(self.log_posterior)
+
+    def snapshot(self):
+        """Captures the current state for a later restore
+
+        Returns:
+            A tuple (log_posterior, successes, trials) holding a copy of
+            the log posterior and the totals observed so far
+        """
+        return self.log_posterior.copy(), self.successes, self.trials
+
+    def restore(self, state):
+        """Rolls the updater back to a snapshot
+
+        Args:
+            state: Tuple returned by snapshot
+        """
+        log_posterior, self.successes, self.trials = state
+        self.log_posterior = log_posterior.copy()
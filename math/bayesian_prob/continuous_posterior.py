@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""Posterior of a binomial probability under a continuous prior"""
+
+import math
+import numpy as np
+check_observations = __import__('0-likelihood').check_observations
+log_binomial_coefficient = __import__(
+    'log_factorial').log_binomial_coefficient
+
+NODES, WEIGHTS = np.polynomial.legendre.leggauss(20)
+
+
+class ContinuousPosterior:
+    """Class that represents the posterior density of p after observing x
+    successes in n trials, under a Beta or arbitrary prior density
+
+    The marginal is integrated by adaptive Gauss-Legendre quadrature:
+    every interval is bisected until the rule over its halves agrees with
+    the rule over the whole interval. Intervals ending where a Beta
+    posterior is unbounded, at 0 or 1, are integrated after a
+    substitution that removes the singularity. The accepted intervals and
+    their running integrals are kept for the CDF and quantiles
+    """
+
+    MAX_DEPTH = 50
+    MAX_INTERVALS = 1 << 16
+
+    def __init__(self, x, n, prior=(1, 1), tol=1e-10):
+        """Class constructor
+
+        Args:
+            x: Number of successes
+            n: Number of trials
+            prior: (a, b) parameters of a Beta prior, or a callable prior
+                   density taking a numpy.ndarray of probabilities
+            tol: Tolerance of the quadrature, relative to the marginal
+
+        Raises:
+            TypeError: If prior is neither a pair nor callable
+            ValueError: If x and n are invalid, if the Beta parameters are
+                        not positive, if the prior density is 0 wherever
+                        the likelihood is not, or if the quadrature meets
+                        an infinite density
+        """
+        self.x, self.n = check_observations(x, n)
+        if callable(prior):
+            self.prior = prior
+            self.log_norm = 0.0
+            self.exponents = (self.x, self.n - self.x)
+            modes = [self.x / self.n]
+        elif isinstance(prior, tuple) and len(prior) == 2:
+            a, b = prior
+            if not a > 0 or not b > 0:
+                raise ValueError("Beta prior parameters must be positive")
+            self.prior = (a, b)
+            self.log_norm = (math.lgamma(a + b) - math.lgamma(a) -
+                             math.lgamma(b))
+            self.exponents = (self.x + a - 1, self.n - self.x + b - 1)
+            modes = [(self.x + a - 1) / (self.n + a + b - 2)
+                     if self.n + a + b > 2 else 0.5]
+        else:
+            raise TypeError("prior must be a pair of Beta parameters or a "
+                            "callable density")
+        self.log_norm += float(log_binomial_coefficient(self.n, self.x))
+
+        # Scale the integrand by its peak so that large n cannot underflow;
+        # a density that is unbounded at 0 or 1 cannot set the scale
+        grid = np.concatenate([np.linspace(0, 1, 4097)[1:-1],
+                               np.clip(modes, 0, 1)])
+        log_values = self.log_kernel(grid)
+        log_values[log_values == np.inf] = -np.inf
+        self.log_peak = np.max(log_values)
+        if not np.isfinite(self.log_peak):
+            raise ValueError("the prior and the likelihood do not overlap")
+        mode = grid[np.argmax(log_values)]
+
+        # Break the domain around the peak, whose width is about 1/sqrt(n)
+        width = math.sqrt(max(mode * (1 - mode), 1 / self.n) / self.n)
+        edges = np.concatenate([np.linspace(0, 1, 17), [mode],
+                                mode + width * np.array([-16, -4, -1, 1, 4,
+                                                         16])])
+        edges = np.unique(np.clip(edges, 0, 1))
+        self.integrate(edges, tol)
+
+        self.log_marginal = (self.log_norm + self.log_peak +
+                             math.log(self.total))
+        self.marginal = math.exp(self.log_marginal)
+
+    def log_kernel(self, p, log_p=None, log_q=None):
+        """Log of the prior times p^x * (1 - p)^(n - x), without constant
+        factors
+
+        log_p and log_q default to log(p) and log(1 - p), and are passed in
+        where p is too close to 0 or 1 to compute them from p
+        """
+        p = np.asarray(p, dtype=float)
+        successes, failures = self.exponents
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if log_p is None:
+                log_p = np.log(p)
+            if log_q is None:
+                log_q = np.log1p(-p)
+            if callable(self.prior):
+                log_values = np.log(self.prior(p))
+            else:
+                log_values = np.zeros(p.shape)
+            # A zero exponent contributes nothing, even at p = 0 or 1
+            if successes:
+                log_values = log_values + successes * log_p
+            if failures:
+                log_values = log_values + failures * log_q
+
+        inside = (p >= 0) & (p <= 1)
+        return np.where(inside & ~np.isnan(log_values), log_values, -np.inf)
+
+    def rule(self, start, stop):
+        """Gauss-Legendre rule of the scaled kernel over each interval"""
+        start, stop = np.broadcast_arrays(np.asarray(start, dtype=float),
+                                          np.asarray(stop, dtype=float))
+        half = (stop - start) / 2
+        points = ((start + stop) / 2)[..., None] + half[..., None] * NODES
+        values = np.exp(self.log_kernel(points) - self.log_peak)
+        with np.errstate(invalid='ignore'):
+            result = np.array(half * (values @ WEIGHTS))
+        result[half == 0] = 0
+
+        # Exponents in (-1, 0) make the density unbounded at that end
+        successes, failures = self.exponents
+        if successes < 0:
+            ends = (start == 0) & (stop > 0)
+            result[ends] = self.end_rule(stop[ends], successes, False)
+        if failures < 0:
+            ends = (stop == 1) & (start < 1)
+            result[ends] = self.end_rule(1 - start[ends], failures, True)
+        return result[()]
+
+    def end_rule(self, width, exponent, right):
+        """Gauss-Legendre rule of the scaled kernel over [0, width], or
+        over [1 - width, 1] if right, where it grows like d^exponent with
+        d the distance to that end
+
+        Substituting d = width * u^k with k = 1 / (1 + exponent) cancels
+        the singularity, leaving a bounded integrand in u over [0, 1].
+        The logs of d and of 1 - d are computed from u, so no node rounds
+        onto the singular end
+        """
+        k = 1 / (1 + exponent)
+        log_u = np.log((1 + NODES) / 2)
+        log_width = np.log(width)[..., None]
+        log_near = log_width + k * log_u
+        log_far = np.log1p(-np.exp(log_near))
+        if right:
+            log_values = self.log_kernel(-np.expm1(log_near), log_far,
+                                         log_near)
+        else:
+            log_values = self.log_kernel(np.exp(log_near), log_near,
+                                         log_far)
+        # dd = width * k * u^(k - 1) du
+        log_values += log_width + math.log(k) + (k - 1) * log_u
+        return np.exp(log_values - self.log_peak) @ WEIGHTS / 2
+
+    def integrate(self, edges, tol):
+        """Integrates the scaled kernel adaptively over [0, 1]
+
+        Intervals are accepted once they converge, at MAX_DEPTH, or once
+        bisecting the rest would leave more than MAX_INTERVALS of them
+
+        Args:
+            edges: Sorted initial breakpoints, including 0 and 1
+            tol: Tolerance relative to the integral
+
+        Raises:
+            ValueError: If the rule is not finite over some interval
+        """
+        start, stop = edges[:-1], edges[1:]
+        whole = self.rule(start, stop)
+        scale = np.sum(whole)
+        accepted = []
+
+        for depth in range(self.MAX_DEPTH):
+            middle = (start + stop) / 2
+            left = self.rule(start, middle)
+            right = self.rule(middle, stop)
+            if not (np.all(np.isfinite(left)) and
+                    np.all(np.isfinite(right)) and np.isfinite(scale)):
+                raise ValueError("the posterior density is infinite at a "
+                                 "quadrature node")
+            scale = max(scale, np.sum(left + right))
+            done = np.abs(left + right - whole) <= tol * scale
+            if (depth == self.MAX_DEPTH - 1 or
+                    2 * np.count_nonzero(~done) > self.MAX_INTERVALS):
+                done[:] = True
+
+            accepted.append((start[done], middle[done], left[done]))
+            accepted.append((middle[done], stop[done], right[done]))
+            start = np.concatenate([start[~done], middle[~done]])
+            stop = np.concatenate([middle[~done], stop[~done]])
+            whole = np.concatenate([left[~done], right[~done]])
+            if len(start) == 0:
+                break
+
+        starts = np.concatenate([part[0] for part in accepted])
+        stops = np.concatenate([part[1] for part in accepted])
+        values = np.concatenate([part[2] for part in accepted])
+        order = np.argsort(starts)
+        self.edges = np.append(starts[order], stops[order][-1])
+        self.cumulative = np.concatenate([[0], np.cumsum(values[order])])
+        self.total = self.cumulative[-1]
+
+    def pdf(self, p):
+        """Calculates the posterior density
+
+        Args:
+            p: Probability or numpy.ndarray of probabilities
+
+        Returns:
+            The posterior density at p
+        """
+        return np.exp(self.log_kernel(p) - self.log_peak) / self.total
+
+    def cdf(self, p):
+        """Calculates the posterior cumulative distribution
+
+        Args:
+            p: Probability or numpy.ndarray of probabilities
+
+        Returns:
+            The posterior probability that the true p is at most p
+        """
+        p = np.clip(np.asarray(p, dtype=float), 0, 1)
+        index = np.clip(np.searchsorted(self.edges, p, side='right') - 1,
+                        0, len(self.edges) - 2)
+        mass = self.cumulative[index] + self.partial(index, p)
+        return np.clip(mass / self.total, 0, 1)
+
+    def partial(self, index, p):
+        """Integrates the scaled kernel from the start of the accepted
+        interval index up to p inside it
+
+        In the last interval, where the density may be unbounded at 1,
+        the mass above p is integrated instead and subtracted
+        """
+        start = self.edges[index]
+        mass = self.rule(start, p)
+        if self.exponents[1] < 0:
+            last = index == len(self.edges) - 2
+            above = (self.cumulative[index + 1] - self.cumulative[index] -
+                     self.rule(p, 1))
+            mass = np.where(last, above, mass)
+        return mass
+
+    def quantile(self, q):
+        """Calculates posterior quantiles by bisection inside the
+        quadrature interval that holds each one
+
+        Args:
+            q: Probability level or numpy.ndarray of levels in [0, 1]
+
+        Returns:
+            The values of p below which the posterior has mass q
+        """
+        target = np.clip(np.asarray(q, dtype=float), 0, 1) * self.total
+        index = np.clip(np.searchsorted(self.cumulative, target) - 1,
+                        0, len(self.edges) - 2)
+        low = self.edges[index]
+        high = self.edges[index + 1]
+        remaining = target - self.cumulative[index]
+
+        for _ in range(60):
+            middle = (low + high) / 2
+            below = self.partial(index, middle) < remaining
+            low = np.where(below, middle, low)
+            high = np.where(below, high, middle)
+
+        return (low + high) / 2
+
+    def interval(self, mass=0.95):
+        """Calculates the equal-tailed credible interval
+
+        Args:
+            mass: Posterior probability inside the interval
+
+        Returns:
+            A tuple (lower, upper) of the interval bounds
+        """
+        lower, upper = self.quantile(np.array([1 - mass, 1 + mass]) / 2)
+        return lower, upper
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Shared table of log factorials for binomial coefficients"""
+
+import math
+import numpy as np
+
+MAX_SIZE = 1 << 20
+
+table = np.zeros(1)
+
+
+def log_factorial(k):
+    """Calculates log(k!) element-wise by table lookup
+
+    The table grows lazily, doubling up to MAX_SIZE entries; larger k
+    fall back to log-gamma
+
+    Args:
+        k: Non-negative int or numpy.ndarray of ints
+
+    Returns:
+        log(k!) with the shape of k
+    """
+    k = np.asarray(k)
+    top = int(np.max(k)) if k.size else 0
+    if top < MAX_SIZE:
+        grow(top + 1)
+        return table[k]
+
+    small = k < MAX_SIZE
+    result = np.empty(k.shape)
+    if np.any(small):
+        grow(int(np.max(k[small])) + 1)
+        result[small] = table[k[small]]
+    result[~small] = [math.lgamma(value + 1) for value in k[~small].tolist()]
+    return result
+
+
+def grow(size):
+    """Extends the table to hold at least size entries"""
+    global table
+    old = len(table)
+    if size <= old:
+        return
+
+    new = min(max(size, 2 * old), MAX_SIZE)
+    extension = np.fromiter(map(math.lgamma, range(old + 1, new + 1)),
+                            dtype=float, count=new - old)
+    table = np.concatenate([table, extension])
+
+
+def log_binomial_coefficient(n, k):
+    """Natural log of the binomial coefficient, element-wise on arrays"""
+    n = np.asarray(n)
+    k = np.asarray(k)
+    return log_factorial(n) - log_factorial(k) - log_factorial(n - k)
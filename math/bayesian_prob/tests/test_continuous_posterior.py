@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Regression tests for posteriors that are unbounded at 0 or 1"""
+
+import math
+import os
+import sys
+import unittest
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+ContinuousPosterior = __import__('continuous_posterior').ContinuousPosterior
+
+
+def beta_cdf(p):
+    """CDF of Beta(1.5, 0.5), through p = sin^2(t)"""
+    t = math.asin(math.sqrt(p))
+    return (t - math.sin(t) * math.cos(t)) / (math.pi / 2)
+
+
+def beta_marginal(x, n, a, b):
+    """Marginal of x successes in n trials under a Beta(a, b) prior"""
+    return math.exp(math.lgamma(n + 1) - math.lgamma(x + 1) -
+                    math.lgamma(n - x + 1) + math.lgamma(x + a) +
+                    math.lgamma(n - x + b) - math.lgamma(n + a + b) +
+                    math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b))
+
+
+class TestSingularPosterior(unittest.TestCase):
+    """Jeffreys prior with all or no successes"""
+
+    def test_all_successes(self):
+        """x == n leaves the density unbounded at 1"""
+        posterior = ContinuousPosterior(1, 1, (0.5, 0.5))
+        self.assertAlmostEqual(posterior.marginal, 0.5, places=9)
+        for p in (0.1, 0.5, 0.99, 1 - 1e-10):
+            self.assertAlmostEqual(float(posterior.cdf(p)), beta_cdf(p),
+                                   places=9)
+        for q in (0.025, 0.5, 0.975):
+            self.assertAlmostEqual(beta_cdf(float(posterior.quantile(q))),
+                                   q, places=9)
+
+    def test_no_successes(self):
+        """x == 0 leaves the density unbounded at 0"""
+        posterior = ContinuousPosterior(0, 1, (0.5, 0.5))
+        self.assertAlmostEqual(posterior.marginal, 0.5, places=9)
+        self.assertEqual(float(posterior.cdf(0)), 0)
+        for p in (1e-10, 0.01, 0.5, 0.9):
+            self.assertAlmostEqual(float(posterior.cdf(p)),
+                                   1 - beta_cdf(1 - p), places=9)
+
+    def test_reported_posteriors(self):
+        """Posteriors that used to bisect until memory ran out"""
+        for x, n, prior in [(5, 5, (0.5, 0.5)), (10, 10, (1, 0.9)),
+                            (0, 5, (0.5, 0.5)), (0, 1000, (0.5, 0.5))]:
+            posterior = ContinuousPosterior(x, n, prior)
+            self.assertLess(len(posterior.edges), 1000)
+            self.assertAlmostEqual(posterior.marginal / beta_marginal(
+                x, n, *prior), 1, places=9)
+            lower, upper = posterior.interval()
+            self.assertTrue(0 <= lower < upper <= 1)
+
+    def test_infinite_prior(self):
+        """A callable prior that is infinite at a node is rejected"""
+        with self.assertRaises(ValueError):
+            ContinuousPosterior(5, 5, lambda p: 1 / np.sqrt(1 - p))
+
+
+if __name__ == '__main__':
+    unittest.main()
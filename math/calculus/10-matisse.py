@@ -1,9 +1,14 @@
 #!/usr/bin/env python3
 """Calculate the derivate of a polynomial vector"""
 
+import numpy as np
+
 
 def poly_derivative(poly):
-    """Calculate the derivate of vector poly"""
+    """Calculate the derivate of vector poly, or of every row of a
+    numpy.ndarray of polynomials with batch_poly_derivative"""
+    if isinstance(poly, np.ndarray):
+        return batch_poly_derivative(poly)
     try:
         iter(poly)
     except TypeError:
@@ -13,3 +18,23 @@ def poly_derivative(poly):
     if len(poly) == 1:
         return [0]
     return [i*coef for i, coef in enumerate(poly)][1:]
+
+
+def batch_poly_derivative(polys):
+    """Calculate the derivatives of many polynomials in one operation
+
+    Args:
+        polys: numpy.ndarray of shape (num_polys, degree + 1) where row i
+               holds the coefficients of polynomial i, zero-padded to the
+               largest degree
+
+    Returns:
+        A numpy.ndarray of shape (num_polys, max(degree, 1)) holding the
+        derivative coefficients, or None if polys is invalid
+    """
+    if (polys.ndim != 2 or polys.shape[1] == 0 or
+            polys.dtype.kind not in 'iuf'):
+        return None
+    if polys.shape[1] == 1:
+        return np.zeros_like(polys)
+    return polys[:, 1:] * np.arange(1, polys.shape[1])
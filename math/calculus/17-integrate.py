@@ -1,9 +1,14 @@
 #!/usr/bin/env python3
 """Derivative of a polynomial"""
 
+import numpy as np
+
 
 def poly_integral(poly, C=0):
-    """Calculates the integral of a polynomial"""
+    """Calculates the integral of a polynomial, or of every row of a
+    numpy.ndarray of polynomials with batch_poly_integral"""
+    if isinstance(poly, np.ndarray):
+        return batch_poly_integral(poly, C)
     integral = []
     # check for the validity of the inputs
     if not isinstance(poly, list) or len(poly) == 0 or not isinstance(C, int):
@@ -22,3 +27,45 @@ def poly_integral(poly, C=0):
             integral[i] = int(integral[i])
 
     return integral[::-1]
+
+
+def batch_poly_integral(polys, C=0, coerce=False):
+    """Calculates the integrals of many polynomials in one operation
+
+    Args:
+        polys: numpy.ndarray of shape (num_polys, degree + 1) where row i
+               holds the coefficients of polynomial i, zero-padded to the
+               largest degree
+        C: Integration constant, or numpy.ndarray of shape (num_polys,)
+           with one constant per polynomial
+        coerce: If True, return lists where every whole-valued coefficient
+                is an int, like poly_integral does
+
+    Returns:
+        A numpy.ndarray of shape (num_polys, degree + 2) holding the
+        integral coefficients (a list of lists if coerce is True), or None
+        if polys or C is invalid
+    """
+    if (polys.ndim != 2 or polys.shape[1] == 0 or
+            polys.dtype.kind not in 'iuf'):
+        return None
+    if isinstance(C, np.ndarray):
+        if C.shape != polys.shape[:1] or C.dtype.kind not in 'iu':
+            return None
+    elif not isinstance(C, int):
+        return None
+
+    integral = np.empty((polys.shape[0], polys.shape[1] + 1))
+    integral[:, 0] = C
+    np.divide(polys, np.arange(1, polys.shape[1] + 1), out=integral[:, 1:])
+    if coerce:
+        return coerce_integers(integral)
+    return integral
+
+
+def coerce_integers(matrix):
+    """Converts a float matrix to lists where whole values become ints"""
+    whole = np.mod(matrix, 1) == 0
+    values = matrix.astype(object)
+    values[whole] = matrix[whole].astype(np.int64).tolist()
+    return values.tolist()
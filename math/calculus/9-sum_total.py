@@ -1,9 +1,21 @@
 #!/usr/bin/env python3
 """Calculate sum of squares"""
 
+import numpy as np
+power_sum = __import__('power_sum').power_sum
 
-def summation_i_squared(n):
-    """Calculate sum of squares up to n"""
+
+def summation_i_squared(n, exact=False):
+    """Calculate sum of squares up to n
+
+    n may also be a numpy.ndarray of integers, giving an array of sums
+    (Python ints when exact is True)
+    """
+    if isinstance(n, np.ndarray):
+        if n.dtype.kind not in 'iu' or np.any(n < 1):
+            return None
+        return power_sum(n, 2, exact)
     if not isinstance(n, (int, float)) or n != int(n) or n < 1:
         return None
-    return sum(map(lambda x: x*x, range(1, n+1)))
+    # Faulhaber's formula for squares, n(n + 1)(2n + 1) / 6
+    return power_sum(int(n), 2)
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""Polynomial type over coefficient lists"""
+
+import numpy as np
+
+
+class Polynomial:
+    """Class that represents a polynomial by its coefficients, where
+    index i holds the coefficient of x^i as in poly_derivative and
+    poly_integral
+
+    Evaluation is vectorized over numpy.ndarray inputs, products of high
+    degree go through the FFT, and the derivative and integral
+    coefficients are computed once and cached
+    """
+
+    BLOCK = 32
+    CHUNK = 8192
+    FFT_THRESHOLD = 64
+
+    def __init__(self, coefficients):
+        """Class constructor
+
+        Args:
+            coefficients: Non-empty list or 1D numpy.ndarray of numbers
+
+        Raises:
+            TypeError: If coefficients is not a non-empty list or array of
+                       numbers
+        """
+        if isinstance(coefficients, list):
+            if any(isinstance(coef, bool) or
+                   not isinstance(coef, (int, float, complex))
+                   for coef in coefficients):
+                raise TypeError("coefficients must be a non-empty list of "
+                                "numbers")
+            coefficients = np.array(coefficients)
+        if (not isinstance(coefficients, np.ndarray) or
+                coefficients.ndim != 1 or coefficients.size == 0 or
+                coefficients.dtype.kind not in 'iufc'):
+            raise TypeError("coefficients must be a non-empty list of "
+                            "numbers")
+
+        self.coefficients = coefficients
+        self.derivative_coefficients = None
+        self.integral_coefficients = None
+
+    @property
+    def degree(self):
+        """Index of the highest nonzero coefficient, 0 for constants"""
+        nonzero = np.flatnonzero(self.coefficients)
+        return int(nonzero[-1]) if len(nonzero) else 0
+
+    def __call__(self, x):
+        """Evaluates the polynomial
+
+        Low degrees use Horner's rule over the whole input. High degrees
+        split the coefficients into blocks of BLOCK: one matrix product
+        evaluates every block at the powers x^0 ... x^(BLOCK - 1), then
+        Horner's rule in x^BLOCK combines the blocks
+
+        Args:
+            x: Number or numpy.ndarray of points
+
+        Returns:
+            The values at x, with the shape of x
+        """
+        points = np.asarray(x)
+        dtype = np.result_type(points, self.coefficients, float)
+        flat = points.ravel().astype(dtype, copy=False)
+        coefficients = self.coefficients.astype(dtype, copy=False)
+
+        if len(coefficients) < 2 * self.BLOCK:
+            values = horner(coefficients, flat)
+        else:
+            values = np.empty(flat.shape, dtype)
+            for start in range(0, len(flat), self.CHUNK):
+                stop = start + self.CHUNK
+                values[start:stop] = blocked_horner(
+                    coefficients, flat[start:stop], self.BLOCK)
+
+        values = values.reshape(points.shape)
+        return values[()] if values.ndim == 0 else values
+
+    def __mul__(self, other):
+        """Multiplies two polynomials
+
+        Products where both factors have at least FFT_THRESHOLD
+        coefficients go through a real FFT; integer products only do so
+        while rounding the result back is exact
+
+        Args:
+            other: Polynomial or number
+
+        Returns:
+            The product Polynomial
+        """
+        if not isinstance(other, Polynomial):
+            return Polynomial(self.coefficients * other)
+
+        first = self.coefficients
+        second = other.coefficients
+        if min(len(first), len(second)) < self.FFT_THRESHOLD:
+            return Polynomial(np.convolve(first, second))
+
+        integer = first.dtype.kind in 'iu' and second.dtype.kind in 'iu'
+        if integer:
+            bound = (float(np.max(np.abs(first))) *
+                     float(np.max(np.abs(second))) *
+                     min(len(first), len(second)))
+            if bound >= 2 ** 50:
+                return Polynomial(np.convolve(first, second))
+
+        if first.dtype.kind == 'c' or second.dtype.kind == 'c':
+            return Polynomial(np.convolve(first, second))
+
+        size = len(first) + len(second) - 1
+        length = 1 << (size - 1).bit_length()
+        product = np.fft.irfft(np.fft.rfft(first, length) *
+                               np.fft.rfft(second, length), length)[:size]
+        if integer:
+            product = np.rint(product).astype(np.int64)
+        return Polynomial(product)
+
+    __rmul__ = __mul__
+
+    def derivative(self):
+        """Calculates the derivative, caching its coefficients
+
+        Returns:
+            The derivative Polynomial, [0] for constants
+        """
+        if self.derivative_coefficients is None:
+            if len(self.coefficients) == 1:
+                self.derivative_coefficients = np.zeros(
+                    1, self.coefficients.dtype)
+            else:
+                powers = np.arange(1, len(self.coefficients))
+                self.derivative_coefficients = (self.coefficients[1:] *
+                                                powers)
+
+        return Polynomial(self.derivative_coefficients)
+
+    def integral(self, C=0):
+        """Calculates the integral, caching its coefficients
+
+        Args:
+            C: Integration constant
+
+        Returns:
+            The integral Polynomial with constant term C
+        """
+        if self.integral_coefficients is None:
+            powers = np.arange(1, len(self.coefficients) + 1)
+            self.integral_coefficients = self.coefficients / powers
+
+        return Polynomial(np.concatenate([[C], self.integral_coefficients]))
+
+    def tolist(self):
+        """Returns the coefficients as a list"""
+        return self.coefficients.tolist()
+
+    def __eq__(self, other):
+        """Compares the coefficients with a Polynomial or a list"""
+        if isinstance(other, Polynomial):
+            other = other.coefficients
+        other = np.asarray(other)
+        return (other.shape == self.coefficients.shape and
+                bool(np.all(other == self.coefficients)))
+
+    def __repr__(self):
+        """Represents the polynomial by its coefficient list"""
+        return "Polynomial({})".format(self.tolist())
+
+
+def horner(coefficients, x):
+    """Evaluates a polynomial at every point of x by Horner's rule"""
+    values = np.full(x.shape, coefficients[-1])
+    for coef in coefficients[-2::-1]:
+        values *= x
+        values += coef
+    return values
+
+
+def blocked_horner(coefficients, x, block):
+    """Evaluates a polynomial of high degree at every point of x by
+    Horner's rule over blocks of coefficients
+
+    Args:
+        coefficients: 1D numpy.ndarray of coefficients
+        x: 1D numpy.ndarray of points
+        block: Number of coefficients per block
+
+    Returns:
+        The values at x
+    """
+    count = -(-len(coefficients) // block)
+    padded = np.zeros(count * block, coefficients.dtype)
+    padded[:len(coefficients)] = coefficients
+    padded = padded.reshape(count, block)
+
+    powers = np.empty((block, len(x)), x.dtype)
+    powers[0] = 1
+    for j in range(1, block):
+        np.multiply(powers[j - 1], x, out=powers[j])
+    partial = padded @ powers
+    step = powers[-1] * x
+
+    values = partial[-1].copy()
+    for j in range(count - 2, -1, -1):
+        values *= step
+        values += partial[j]
+    return values
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Closed-form sums of powers of the first n integers"""
+
+from fractions import Fraction
+from math import comb, gcd
+import numpy as np
+
+bernoulli_numbers = [Fraction(1)]
+faulhaber_cache = {}
+
+
+def bernoulli(m):
+    """Calculates the Bernoulli number B_m, with B_1 = -1/2
+
+    The numbers are cached and the cache grows lazily up to m
+    """
+    for k in range(len(bernoulli_numbers), m + 1):
+        total = sum(comb(k + 1, j) * bernoulli_numbers[j] for j in range(k))
+        bernoulli_numbers.append(-total / (k + 1))
+    return bernoulli_numbers[m]
+
+
+def faulhaber(p):
+    """Calculates the coefficients of Faulhaber's formula for sums of p-th
+    powers
+
+    Args:
+        p: Non-negative integer power
+
+    Returns:
+        A tuple (coefficients, denominator) where coefficients[k] is the
+        integer coefficient of n^k in denominator * (1^p + ... + n^p)
+    """
+    if p not in faulhaber_cache:
+        fractions = [Fraction(0)] * (p + 2)
+        for j in range(p + 1):
+            # Faulhaber's formula uses B_1 = +1/2
+            number = -bernoulli(j) if j == 1 else bernoulli(j)
+            fractions[p + 1 - j] = comb(p + 1, j) * number / (p + 1)
+
+        denominator = 1
+        for fraction in fractions:
+            denominator = (denominator * fraction.denominator //
+                           gcd(denominator, fraction.denominator))
+        coefficients = [int(fraction * denominator) for fraction in fractions]
+        faulhaber_cache[p] = (coefficients, denominator)
+
+    return faulhaber_cache[p]
+
+
+def exact_power_sum(n, p):
+    """Calculates 1^p + ... + n^p for an int n with integer arithmetic"""
+    coefficients, denominator = faulhaber(p)
+    total = 0
+    for coefficient in reversed(coefficients):
+        total = total * n + coefficient
+    return total // denominator
+
+
+def power_sum(n, p=2, exact=False):
+    """Calculates 1^p + 2^p + ... + n^p in closed form
+
+    Args:
+        n: Non-negative int, or numpy.ndarray of non-negative ints
+        p: Non-negative integer power
+        exact: For arrays, return Python ints in an object array instead
+               of floats
+
+    Returns:
+        The sum as a Python int for an int n, or an array of sums with
+        the shape of n, or None if n or p is invalid
+    """
+    if not isinstance(p, int) or isinstance(p, bool) or p < 0:
+        return None
+
+    if not isinstance(n, np.ndarray):
+        if not isinstance(n, int) or isinstance(n, bool) or n < 0:
+            return None
+        return exact_power_sum(n, p)
+
+    if n.dtype.kind not in 'iu' or np.any(n < 0):
+        return None
+    if exact:
+        sums = [exact_power_sum(value, p) for value in n.ravel().tolist()]
+        return np.array(sums, dtype=object).reshape(n.shape)
+
+    coefficients, denominator = faulhaber(p)
+    points = n.astype(float)
+    values = np.zeros(n.shape)
+    for coefficient in reversed(coefficients):
+        values *= points
+        values += coefficient / denominator
+    return values
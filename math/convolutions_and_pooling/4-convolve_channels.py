@@ -2,13 +2,18 @@
 """Convolution with Channels"""
 
 
-import numpy as np
+parallel_engine = __import__('convolution_engine').parallel_engine
 
 
-def convolve_channels(images, kernel, padding='same', stride=(1, 1)):
-    """Function to perform convolution with channels"""
+def convolve_channels(images, kernel, padding='same', stride=(1, 1),
+                      workers=None):
+    """Function to perform convolution with channels
 
-    m, h, w, c = images.shape
+    workers is the number of threads splitting the images, see
+    parallel_engine
+    """
+
+    _, h, w, c = images.shape
     kh, kw, kc = kernel.shape
     sh, sw = stride
 
@@ -25,21 +30,8 @@ def convolve_channels(images, kernel, padding='same', stride=(1, 1)):
     else:
         ph, pw = padding
 
-    # Gives dimensions of the output after padding and considering stride
-    new_h = (h + 2 * ph - kh) // sh + 1
-    new_w = (w + 2 * pw - kw) // sw + 1
-
-    # Pad the images
-    padded = np.pad(images, (
-        (0, 0), (ph, ph), (pw, pw), (0, 0)), mode='constant')
-
-    # Initialize the output array
-    output = np.zeros((m, new_h, new_w))
-
-    # Convolve the images with kernel
-    for y in range(0, new_h * sh, sh):
-        for x in range(0, new_w * sw, sw):
-            output[:, y // sh, x // sw] = np.sum(
-                padded[:, y: y + kh, x: x + kw, :] * kernel, axis=(1, 2, 3))
+    # Convolve over the strided sliding windows of the padded images
+    output = parallel_engine(images, kernel[..., None], (ph, pw), (sh, sw),
+                             workers=workers)
 
-    return output
+    return output[..., 0]
@@ -3,13 +3,75 @@
 
 
 import numpy as np
+parallel_engine = __import__('convolution_engine').parallel_engine
+stream_engine = __import__('convolution_engine').stream_engine
 
 
-def convolve(images, kernels, padding='same', stride=(1, 1)):
-    """Function to perform convolution with multiple kernels"""
+def convolve(images, kernels, padding='same', stride=(1, 1),
+             method='direct', workers=None):
+    """Function to perform convolution with multiple kernels
 
-    m, h, w, c = images.shape
-    kh, kw, kc, nc = kernels.shape
+    method is 'direct', 'fft' or 'auto', see convolve_engine, and workers
+    is the number of threads, see parallel_engine
+    """
+
+    ph, pw = padding_of(images.shape, kernels.shape, padding, stride)
+
+    # One GEMM of the strided sliding windows against every kernel
+    return parallel_engine(images, kernels, (ph, pw), stride, method,
+                           workers)
+
+
+def convolve_memmap(images, kernels, output=None, padding='same',
+                    stride=(1, 1), method='direct', batch=64):
+    """Function to perform convolution with multiple kernels on an image
+    dataset that does not fit in memory
+
+    The images are read, padded and convolved batch images at a time and
+    written straight into output
+
+    Args:
+        images: numpy.ndarray or numpy.memmap of shape (m, h, w, c), or
+                the path of a .npy file to memory-map
+        kernels: numpy.ndarray of shape (kh, kw, c, nc)
+        output: Preallocated numpy.ndarray or numpy.memmap of shape
+                (m, new_h, new_w, nc), or the path of a .npy file to create;
+                a new array is allocated if None
+        padding: See convolve
+        stride: See convolve
+        method: See convolve
+        batch: Number of images convolved at once
+
+    Returns:
+        output holding the convolutions
+    """
+    if isinstance(images, str):
+        images = np.load(images, mmap_mode='r')
+
+    ph, pw = padding_of(images.shape, kernels.shape, padding, stride)
+    m, h, w, _ = images.shape
+    kh, kw, _, nc = kernels.shape
+    shape = (m, (h + 2 * ph - kh) // stride[0] + 1,
+             (w + 2 * pw - kw) // stride[1] + 1, nc)
+    dtype = np.result_type(images.dtype, kernels.dtype, float)
+    if output is None:
+        output = np.empty(shape, dtype)
+    elif isinstance(output, str):
+        output = np.lib.format.open_memmap(output, mode='w+', dtype=dtype,
+                                           shape=shape)
+
+    return stream_engine(images, kernels, output, (ph, pw), stride, method,
+                         batch)
+
+
+def padding_of(image_shape, kernel_shape, padding, stride):
+    """Calculates the padding on each side of the height and width
+
+    Raises:
+        ValueError: If the images and kernels have different channels
+    """
+    m, h, w, c = image_shape
+    kh, kw, kc, nc = kernel_shape
     sh, sw = stride
 
     # Check if channels in images match channels in kernel
@@ -25,23 +87,4 @@ def convolve(images, kernels, padding='same', stride=(1, 1)):
     else:
         ph, pw = padding
 
-    # Gives dimensions of the output after padding and considering stride
-    new_h = (h + 2 * ph - kh) // sh + 1
-    new_w = (w + 2 * pw - kw) // sw + 1
-
-    # Pad the images
-    padded = np.pad(images,
-                    ((0, 0), (ph, ph), (pw, pw), (0, 0)), mode='constant')
-
-    # Initialize the output array
-    output = np.zeros((m, new_h, new_w, nc))
-
-    # Convolve the images with multiple kernels
-    for n in range(nc):
-        for y in range(0, new_h * sh, sh):
-            for x in range(0, new_w * sw, sw):
-                output[:, y // sh, x // sw, n] = np.sum(
-                    padded[:, y: y + kh, x: x + kw, :] * kernels[:, :, :, n],
-                    axis=(1, 2, 3))
-
-    return output
+    return ph, pw
@@ -4,31 +4,91 @@
 
 import numpy as np
 
+MODES = ('max', 'avg', 'min', 'l2')
 
-def pool(images, kernel_shape, stride, mode='max'):
-    """Function to perform pooling on images"""
+
+def pool(images, kernel_shape, stride, mode='max', padding=(0, 0),
+         return_indices=False):
+    """Function to perform pooling on images
+
+    Every output is one reduction over a strided sliding window view of
+    the images, so no Python loop runs over output positions
+
+    Args:
+        images: numpy.ndarray of shape (m, h, w, c)
+        kernel_shape: Tuple (kh, kw) of the pooling window, or None for
+                      global pooling over the whole padded image
+        stride: Tuple (sh, sw) of the strides
+        mode: 'max', 'avg', 'min' or 'l2' (square root of the sum of
+              squares)
+        padding: Tuple (ph, pw) added on each side of the height and
+                 width; padded cells never win a max or min and are left
+                 out of averages
+        return_indices: If True, also return the position of the max or
+                        min of each window, as a flat index h_i * w + w_i
+                        into its unpadded image channel
+
+    Returns:
+        A numpy.ndarray of shape (m, new_h, new_w, c), and the indices of
+        the same shape if return_indices is True
+
+    Raises:
+        ValueError: If mode is unknown, if indices are requested for
+                    'avg' or 'l2' pooling, or if padding is not smaller
+                    than kernel_shape, which would allow windows made only
+                    of padding
+    """
+    if mode not in MODES:
+        raise ValueError("Mode should be one of 'max', 'avg', 'min' or 'l2'")
+    if return_indices and mode not in ('max', 'min'):
+        raise ValueError("Indices are only available for 'max' and 'min'")
 
     m, h, w, c = images.shape
+    ph, pw = padding
+    if kernel_shape is None:
+        kernel_shape = (h + 2 * ph, w + 2 * pw)
     kh, kw = kernel_shape
     sh, sw = stride
+    if ph >= kh or pw >= kw:
+        raise ValueError("Padding should be smaller than kernel_shape")
+
+    # Pad with a value that cannot change the result of the reduction
+    dtype = np.result_type(images, float)
+    fill = {'max': -np.inf, 'min': np.inf}.get(mode, 0)
+    padded = images.astype(dtype, copy=False)
+    if ph or pw:
+        padded = np.pad(padded, ((0, 0), (ph, ph), (pw, pw), (0, 0)),
+                        mode='constant', constant_values=fill)
+
+    # (m, new_h, new_w, c, kh, kw) view into padded
+    windows = np.lib.stride_tricks.sliding_window_view(
+        padded, (kh, kw), axis=(1, 2))[:, ::sh, ::sw]
+
+    if mode == 'avg':
+        total = np.sum(windows, axis=(4, 5))
+        if ph == 0 and pw == 0:
+            return total / (kh * kw)
+        inside = np.pad(np.ones((h, w)), ((ph, ph), (pw, pw)))
+        counts = np.lib.stride_tricks.sliding_window_view(
+            inside, (kh, kw)).sum(axis=(2, 3))[::sh, ::sw]
+        return total / counts[None, :, :, None]
+    if mode == 'l2':
+        return np.sqrt(np.einsum('...ij,...ij->...', windows, windows))
+    if not return_indices:
+        if mode == 'max':
+            return np.max(windows, axis=(4, 5))
+        return np.min(windows, axis=(4, 5))
+
+    flat = windows.reshape(windows.shape[:4] + (kh * kw,))
+    if mode == 'max':
+        local = np.argmax(flat, axis=-1)
+    else:
+        local = np.argmin(flat, axis=-1)
+    output = np.take_along_axis(flat, local[..., None], axis=-1)[..., 0]
+
+    # Convert the position in each window to a position in its image
+    rows = (np.arange(output.shape[1]) * sh)[None, :, None, None]
+    cols = (np.arange(output.shape[2]) * sw)[None, None, :, None]
+    indices = (rows + local // kw - ph) * w + (cols + local % kw - pw)
 
-    # Gives dimensions of the output after pooling and considering stride
-    new_h = (h - kh) // sh + 1
-    new_w = (w - kw) // sw + 1
-
-    # Initialize the output array
-    output = np.zeros((m, new_h, new_w, c))
-
-    # Pooling operation based on mode
-    for y in range(0, new_h * sh, sh):
-        for x in range(0, new_w * sw, sw):
-            if mode == 'max':
-                output[:, y // sh, x // sw, :] = np.max(
-                    images[:, y: y + kh, x: x + kw, :], axis=(1, 2))
-            elif mode == 'avg':
-                output[:, y // sh, x // sw, :] = np.mean(
-                    images[:, y: y + kh, x: x + kw, :], axis=(1, 2))
-            else:
-                raise ValueError("Mode should be either 'max' or 'avg'")
-
-    return output
+    return output, indices
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""Sliding window engine shared by the convolution functions"""
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import threading
+import numpy as np
+
+BUDGET = 1 << 27
+FFT_FACTOR = 3
+SPECTRA_CACHE_BYTES = 1 << 28
+
+spectra_cache = OrderedDict()
+spectra_lock = threading.Lock()
+
+
+def convolve_engine(images, kernels, padding=(0, 0), stride=(1, 1),
+                    method='direct'):
+    """Convolves a batch of images with a bank of kernels
+
+    Args:
+        images: numpy.ndarray of shape (m, h, w, c)
+        kernels: numpy.ndarray of shape (kh, kw, c, nc)
+        padding: Tuple (ph, pw) of zero padding on each side of the height
+                 and the width
+        stride: Tuple (sh, sw) of the strides along the height and width
+        method: 'direct' for direct_engine, 'fft' for fft_engine, or
+                'auto' to pick the cheaper one with fft_is_faster
+
+    Returns:
+        A numpy.ndarray of shape (m, new_h, new_w, nc) of the convolutions
+
+    Raises:
+        ValueError: If method is not 'direct', 'fft' or 'auto'
+    """
+    if method not in ('direct', 'fft', 'auto'):
+        raise ValueError("method must be 'direct', 'fft' or 'auto'")
+    # rfft2 only handles real data
+    real = (np.result_type(images, kernels).kind != 'c')
+    if method == 'auto':
+        use_fft = real and fft_is_faster(images.shape, kernels.shape,
+                                         padding, stride)
+    else:
+        use_fft = real and method == 'fft'
+
+    if use_fft:
+        return fft_engine(images, kernels, padding, stride)
+    return direct_engine(images, kernels, padding, stride)
+
+
+def parallel_engine(images, kernels, padding=(0, 0), stride=(1, 1),
+                    method='direct', workers=None):
+    """Convolves a batch of images with a bank of kernels on a thread pool
+
+    Whichever of the images and the kernels is more numerous is split into
+    at most one chunk per worker. Every worker writes its own disjoint
+    slice of one shared output; NumPy releases the GIL inside the heavy
+    calls, so the workers run concurrently
+
+    Args:
+        images: numpy.ndarray of shape (m, h, w, c)
+        kernels: numpy.ndarray of shape (kh, kw, c, nc)
+        padding: See convolve_engine
+        stride: See convolve_engine
+        method: See convolve_engine
+        workers: Number of threads; None or 1 runs convolve_engine directly
+
+    Returns:
+        A numpy.ndarray of shape (m, new_h, new_w, nc) of the convolutions
+    """
+    m, h, w, _ = images.shape
+    kh, kw, _, nc = kernels.shape
+    axis_size = max(m, nc)
+    if workers is None or workers <= 1 or axis_size <= 1:
+        return convolve_engine(images, kernels, padding, stride, method)
+
+    shape = (m, (h + 2 * padding[0] - kh) // stride[0] + 1,
+             (w + 2 * padding[1] - kw) // stride[1] + 1, nc)
+    output = np.empty(shape, np.result_type(images, kernels, float))
+    bounds = np.linspace(0, axis_size, min(workers, axis_size) + 1,
+                         dtype=int)
+
+    def work(start, stop):
+        """Convolves one chunk into its slice of output"""
+        if m >= nc:
+            output[start:stop] = convolve_engine(
+                images[start:stop], kernels, padding, stride, method)
+        else:
+            output[..., start:stop] = convolve_engine(
+                images, kernels[..., start:stop], padding, stride, method)
+
+    with ThreadPoolExecutor(workers) as executor:
+        futures = [executor.submit(work, start, stop)
+                   for start, stop in zip(bounds[:-1], bounds[1:])]
+        for future in futures:
+            future.result()
+
+    return output
+
+
+def stream_engine(images, kernels, output, padding=(0, 0), stride=(1, 1),
+                  method='direct', batch=64):
+    """Convolves a batch of images too large for memory, a few images at
+    a time
+
+    Only batch images are read, padded and convolved at once, so peak
+    memory depends on batch and not on the number of images
+
+    Args:
+        images: numpy.ndarray or numpy.memmap of shape (m, h, w, c)
+        kernels: numpy.ndarray of shape (kh, kw, c, nc)
+        output: Preallocated numpy.ndarray or numpy.memmap of shape
+                (m, new_h, new_w, nc) receiving the convolutions
+        padding: See convolve_engine
+        stride: See convolve_engine
+        method: See convolve_engine
+        batch: Number of images convolved at once
+
+    Returns:
+        output, flushed to disk if it is a numpy.memmap
+    """
+    for start in range(0, len(images), batch):
+        stop = min(start + batch, len(images))
+        output[start:stop] = convolve_engine(np.asarray(images[start:stop]),
+                                             kernels, padding, stride, method)
+
+    if isinstance(output, np.memmap):
+        output.flush()
+    return output
+
+
+def direct_engine(images, kernels, padding=(0, 0), stride=(1, 1)):
+    """Convolves a batch of images with a bank of kernels as a GEMM
+
+    A zero-copy sliding window view of the padded images, taken every
+    stride, is unrolled into an (outputs, kh * kw * c) matrix (im2col) and
+    multiplied by the kernel bank reshaped to (kh * kw * c, nc), instead of
+    looping over output kernels, rows and columns. The images are unrolled
+    a few at a time so the unrolled matrix stays around BUDGET bytes
+
+    Args:
+        images: numpy.ndarray of shape (m, h, w, c)
+        kernels: numpy.ndarray of shape (kh, kw, c, nc)
+        padding: Tuple (ph, pw) of zero padding on each side of the height
+                 and the width
+        stride: Tuple (sh, sw) of the strides along the height and width
+
+    Returns:
+        A numpy.ndarray of shape (m, new_h, new_w, nc) of the convolutions
+    """
+    m = images.shape[0]
+    kh, kw, c, nc = kernels.shape
+    ph, pw = padding
+    sh, sw = stride
+
+    padded = np.pad(images, ((0, 0), (ph, ph), (pw, pw), (0, 0)),
+                    mode='constant')
+    # (m, new_h, new_w, c, kh, kw) view into padded
+    windows = np.lib.stride_tricks.sliding_window_view(
+        padded, (kh, kw), axis=(1, 2))[:, ::sh, ::sw]
+    new_h, new_w = windows.shape[1:3]
+
+    dtype = np.result_type(images, kernels, float)
+    matrix = kernels.transpose(2, 0, 1, 3).reshape(c * kh * kw, nc)
+    matrix = matrix.astype(dtype, copy=False)
+    output = np.empty((m, new_h, new_w, nc), dtype)
+
+    size = new_h * new_w * c * kh * kw * dtype.itemsize
+    step = max(1, BUDGET // max(size, 1))
+    for start in range(0, m, step):
+        stop = min(start + step, m)
+        columns = np.asarray(windows[start:stop], dtype)
+        np.matmul(columns.reshape(-1, c * kh * kw), matrix,
+                  out=output[start:stop].reshape(-1, nc))
+
+    return output
+
+
+def fft_engine(images, kernels, padding=(0, 0), stride=(1, 1)):
+    """Convolves a batch of images with a bank of kernels through rfft2
+
+    Each output is the cross-correlation of a padded image with a kernel,
+    which is the inverse transform of the image spectrum times the
+    conjugate kernel spectrum. A circular transform at least as large as
+    the padded image does not wrap into any valid output, so the
+    transform size is the next 2-3-5 smooth size above it. Strides
+    subsample the full result. The images are transformed a few at a time
+    so their spectra and products stay around BUDGET bytes
+
+    Args:
+        images: numpy.ndarray of shape (m, h, w, c) of real values
+        kernels: numpy.ndarray of shape (kh, kw, c, nc) of real values
+        padding: Tuple (ph, pw) of zero padding on each side of the height
+                 and the width
+        stride: Tuple (sh, sw) of the strides along the height and width
+
+    Returns:
+        A numpy.ndarray of shape (m, new_h, new_w, nc) of the convolutions
+    """
+    m, h, w, c = images.shape
+    kh, kw, _, nc = kernels.shape
+    ph, pw = padding
+    sh, sw = stride
+
+    height, width = h + 2 * ph, w + 2 * pw
+    new_h = (height - kh) // sh + 1
+    new_w = (width - kw) // sw + 1
+    shape = (fast_length(height), fast_length(width))
+    spectra_k = kernel_spectra(kernels, shape)
+
+    dtype = np.result_type(images, kernels, float)
+    output = np.empty((m, new_h, new_w, nc), dtype)
+
+    # Padded images, their spectra, the products and the full inverse
+    area = shape[0] * shape[1]
+    size = (height * width * c + area * (c + nc) + area * nc) * 8
+    step = max(1, BUDGET // max(size, 1))
+    for start in range(0, m, step):
+        stop = min(start + step, m)
+        padded = np.pad(images[start:stop],
+                        ((0, 0), (ph, ph), (pw, pw), (0, 0)),
+                        mode='constant')
+        # (fh, fw, m, c) @ (fh, fw, c, nc) sums the channels per frequency
+        spectra = np.fft.rfft2(padded, shape,
+                               axes=(1, 2)).transpose(1, 2, 0, 3)
+        product = np.matmul(spectra, spectra_k)
+        full = np.fft.irfft2(product.transpose(2, 0, 1, 3), shape,
+                             axes=(1, 2))
+        output[start:stop] = full[:, :(new_h - 1) * sh + 1:sh,
+                                  :(new_w - 1) * sw + 1:sw]
+
+    return output
+
+
+def kernel_spectra(kernels, shape):
+    """Returns the conjugate rfft2 of a kernel bank, cached per kernel bank
+    and transform size
+
+    The cache keeps the most recently used spectra up to
+    SPECTRA_CACHE_BYTES in total; larger spectra are never cached. Kernel
+    banks are keyed by a digest of their values rather than a copy
+
+    Args:
+        kernels: numpy.ndarray of shape (kh, kw, c, nc) of real values
+        shape: Tuple (fh, fw) of the transform size
+
+    Returns:
+        A numpy.ndarray of shape (fh, fw // 2 + 1, c, nc)
+    """
+    c, nc = kernels.shape[2:]
+    size = shape[0] * (shape[1] // 2 + 1) * c * nc * 16
+    if size > SPECTRA_CACHE_BYTES:
+        return np.conj(np.fft.rfft2(kernels, shape, axes=(0, 1)))
+
+    digest = hashlib.blake2b(np.ascontiguousarray(kernels),
+                             digest_size=16).digest()
+    key = (kernels.shape, kernels.dtype.str, shape, digest)
+    with spectra_lock:
+        if key in spectra_cache:
+            spectra_cache.move_to_end(key)
+            return spectra_cache[key]
+
+    spectra = np.conj(np.fft.rfft2(kernels, shape, axes=(0, 1)))
+    with spectra_lock:
+        spectra_cache[key] = spectra
+        total = sum(value.nbytes for value in spectra_cache.values())
+        while total > SPECTRA_CACHE_BYTES:
+            _, evicted = spectra_cache.popitem(last=False)
+            total -= evicted.nbytes
+    return spectra
+
+
+def fast_length(n):
+    """Finds the smallest 2-3-5 smooth integer, which FFTs handle
+    quickly, that is at least n"""
+    best = 1 << max(n - 1, 0).bit_length()
+    power5 = 1
+    while power5 < best:
+        power35 = power5
+        while power35 < best:
+            # Smallest power of 2 taking power35 to at least n
+            length = power35
+            while length < n:
+                length *= 2
+            best = min(best, length)
+            power35 *= 3
+        power5 *= 5
+    return best
+
+
+def fft_is_faster(image_shape, kernel_shape, padding, stride):
+    """Cost model comparing the direct GEMM with the FFT path
+
+    The direct path costs one multiply-add per kernel weight, output and
+    kernel. The FFT path costs a transform of every padded image channel
+    and of every output, plus one multiply-add per frequency, channel and
+    kernel
+
+    Args:
+        image_shape: Shape (m, h, w, c) of the images
+        kernel_shape: Shape (kh, kw, c, nc) of the kernels
+        padding: Tuple (ph, pw) of the padding
+        stride: Tuple (sh, sw) of the strides
+
+    Returns:
+        True if the FFT path should be cheaper
+    """
+    m, h, w, c = image_shape
+    kh, kw, _, nc = kernel_shape
+    height = h + 2 * padding[0]
+    width = w + 2 * padding[1]
+    new_h = (height - kh) // stride[0] + 1
+    new_w = (width - kw) // stride[1] + 1
+    if new_h <= 0 or new_w <= 0:
+        return False
+
+    direct = m * new_h * new_w * kh * kw * c * nc
+    area = fast_length(height) * fast_length(width)
+    fft = m * area * (FFT_FACTOR * np.log2(max(area, 2)) * (c + nc) +
+                      2 * c * nc)
+    return fft < direct
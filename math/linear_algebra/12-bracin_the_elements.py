@@ -1,22 +1,46 @@
 #!/usr/bin/env python3
 """Function to perform element-wise operations on numpy.ndarrays"""
 
+import numpy as np
 
-def np_elementwise(mat1, mat2):
+OPERATIONS = {'add': np.add, 'sub': np.subtract,
+              'mul': np.multiply, 'div': np.true_divide}
+
+
+def np_elementwise(mat1, mat2, out=None, operations=None):
     """Performs element-wise addition, subtraction, multiplication, and
     division
 
     Args:
         mat1: First numpy.ndarray
         mat2: Second numpy.ndarray or scalar
+        out: Optional sequence of preallocated numpy.ndarrays, one per
+             requested operation, that the results are written into
+             instead of allocating new arrays (None entries allocate)
+        operations: Optional subset of 'add', 'sub', 'mul' and 'div' to
+                    compute, in the order the results are returned
+                    (default: all four)
 
     Returns:
         A tuple containing the element-wise sum, difference, product, and
-        quotient
+        quotient, or only the requested operations
+
+    Raises:
+        ValueError: If operations is a string or names an unknown
+                    operation, or if out does not hold one entry per
+                    operation
     """
-    addition = mat1 + mat2
-    subtraction = mat1 - mat2
-    multiplication = mat1 * mat2
-    division = mat1 / mat2
+    if operations is None:
+        operations = ('add', 'sub', 'mul', 'div')
+    if (isinstance(operations, str) or
+            any(not isinstance(name, str) or name not in OPERATIONS
+                for name in operations)):
+        raise ValueError("operations must be a sequence of 'add', 'sub', "
+                         "'mul' and 'div'")
+    if out is None:
+        out = (None,) * len(operations)
+    if len(out) != len(operations):
+        raise ValueError("out must hold one array per operation")
 
-    return (addition, subtraction, multiplication, division)
+    return tuple(OPERATIONS[name](mat1, mat2, out=buffer)
+                 for name, buffer in zip(operations, out))
@@ -4,14 +4,128 @@
 import numpy as np
 
 
-def np_matmul(mat1, mat2):
+def np_matmul(mat1, mat2, mixed_precision=False, chunk=256):
     """Performs matrix multiplication
 
+    Args:
+        mat1: First numpy.ndarray, or a non-empty list of 2D or higher
+              numpy.ndarrays
+        mat2: Second numpy.ndarray, or a non-empty list of 2D or higher
+              numpy.ndarrays holding the right operand of each product
+        mixed_precision: If True, compute in float32 over blocks of the
+                         inner dimension and accumulate the blocks in
+                         float64
+        chunk: Size of the inner dimension blocks in mixed precision
+
+    Returns:
+        A new numpy.ndarray containing the matrix product of mat1 and mat2,
+        or a list with the product of each pair when both are lists of
+        matrices. Anything else is multiplied as by numpy.matmul
+    """
+    if is_batch(mat1) and is_batch(mat2):
+        return batched_matmul(mat1, mat2, mixed_precision, chunk)
+
+    return matmul(mat1, mat2, mixed_precision, chunk)
+
+
+def is_batch(operand):
+    """Checks whether operand is a list of matrices rather than an array
+    given as a list"""
+    return (isinstance(operand, list) and len(operand) > 0 and
+            all(isinstance(matrix, np.ndarray) and matrix.ndim >= 2
+                for matrix in operand))
+
+
+def batched_matmul(mats1, mats2, mixed_precision=False, chunk=256):
+    """Multiplies many pairs of differently-sized matrices
+
+    Pairs with the same shapes and dtypes are grouped into one bucket and
+    multiplied with a single stacked matmul
+
+    Args:
+        mats1: List of left operands
+        mats2: List of right operands
+        mixed_precision: See np_matmul
+        chunk: See np_matmul
+
+    Returns:
+        A list with the product of each pair, in order
+
+    Raises:
+        ValueError: If mats1 and mats2 do not have the same length
+    """
+    if len(mats1) != len(mats2):
+        raise ValueError("mat1 and mat2 must hold the same number of "
+                         "matrices")
+
+    buckets = {}
+    for index, (matrix1, matrix2) in enumerate(zip(mats1, mats2)):
+        key = (matrix1.shape, matrix2.shape,
+               np.result_type(matrix1, matrix2))
+        buckets.setdefault(key, []).append(index)
+
+    products = [None] * len(mats1)
+    for indices in buckets.values():
+        stacked = matmul(np.stack([mats1[i] for i in indices]),
+                         np.stack([mats2[i] for i in indices]),
+                         mixed_precision, chunk)
+        for position, index in enumerate(indices):
+            products[index] = stacked[position]
+
+    return products
+
+
+def matmul(mat1, mat2, mixed_precision=False, chunk=256):
+    """Multiplies two arrays, optionally in float32 with float64
+    accumulation
+
     Args:
         mat1: First numpy.ndarray
         mat2: Second numpy.ndarray
+        mixed_precision: See np_matmul
+        chunk: See np_matmul
+
+    Returns:
+        The matrix product of mat1 and mat2
+    """
+    mat1 = blas_ready(np.asarray(mat1))
+    mat2 = blas_ready(np.asarray(mat2))
+    if not mixed_precision:
+        return np.matmul(mat1, mat2)
+
+    mat1 = mat1.astype(np.float32)
+    mat2 = mat2.astype(np.float32)
+    inner = mat1.shape[-1]
+    result = None
+    for start in range(0, max(inner, 1), chunk):
+        stop = start + chunk
+        if mat2.ndim == 1:
+            block = mat2[start:stop]
+        else:
+            block = mat2[..., start:stop, :]
+        partial = np.matmul(mat1[..., start:stop], block).astype(np.float64)
+        if result is None:
+            result = partial
+        else:
+            result += partial
+
+    return result
+
+
+def blas_ready(matrix):
+    """Copies a matrix to C order only when BLAS could not use it as is
+
+    BLAS reads C and Fortran ordered matrices without a copy, so only
+    matrices where neither of the last two axes is contiguous are copied
+
+    Args:
+        matrix: numpy.ndarray
 
     Returns:
-        A new numpy.ndarray containing the matrix product of mat1 and mat2
+        matrix, or a C-contiguous copy of it
     """
-    return np.matmul(mat1, mat2)
+    if matrix.ndim < 2:
+        return matrix
+    if matrix.itemsize in (abs(matrix.strides[-1]), abs(matrix.strides[-2])):
+        return matrix
+    return np.ascontiguousarray(matrix)
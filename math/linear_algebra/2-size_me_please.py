@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 """Function to calculate the shape of a matrix"""
 
+shape_of = __import__('nested_list').shape_of
+
 
 def matrix_shape(matrix):
     """Calculates the shape of a matrix
@@ -11,13 +13,4 @@ def matrix_shape(matrix):
     Returns:
         A list of integers representing the dimensions of the matrix
     """
-    shape = []
-    current = matrix
-
-    while isinstance(current, list):
-        shape.append(len(current))
-        if len(current) == 0:
-            break
-        current = current[0]
-
-    return shape
+    return shape_of(matrix)
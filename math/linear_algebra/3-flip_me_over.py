@@ -1,16 +1,24 @@
 #!/usr/bin/env python3
 """Function to transpose a 2D matrix"""
 
+MatrixView = __import__('matrix_view').MatrixView
+
 
 def matrix_transpose(matrix):
     """Returns the transpose of a 2D matrix.
 
     Args:
-        matrix: A 2D matrix to transpose
+        matrix: A 2D matrix to transpose, as a list of lists or a
+                MatrixView
 
     Returns:
-        A new matrix that is the transpose of the input matrix
+        A new matrix that is the transpose of the input matrix, or a
+        MatrixView sharing the data of a MatrixView input
     """
+    # Views transpose in O(1) by swapping their shape and strides
+    if isinstance(matrix, MatrixView):
+        return matrix.transpose()
+
     # Get dimensions of the input matrix
     rows = len(matrix)
     cols = len(matrix[0])
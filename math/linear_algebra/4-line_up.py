@@ -1,25 +1,19 @@
 #!/usr/bin/env python3
 """Function to add two arrays element-wise"""
 
+nd_add = __import__('nested_list').nd_add
+
 
 def add_arrays(arr1, arr2):
     """Adds two arrays element-wise
 
     Args:
-        arr1: First array (list of ints/floats)
-        arr2: Second array (list of ints/floats)
+        arr1: First array (nested list of ints/floats, of any dimension)
+        arr2: Second array (nested list of ints/floats, of any dimension)
 
     Returns:
         A new list containing the sum of the arrays element-wise,
         or None if arr1 and arr2 are not the same shape
     """
-    # Check if arrays have the same shape
-    if len(arr1) != len(arr2):
-        return None
-
-    # Add arrays element-wise
-    result = []
-    for i in range(len(arr1)):
-        result.append(arr1[i] + arr2[i])
-
-    return result
+    # Add the flat buffers of both arrays, which also checks their shapes
+    return nd_add(arr1, arr2)
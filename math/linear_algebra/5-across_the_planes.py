@@ -1,6 +1,10 @@
 #!/usr/bin/env python3
 """Function to add two 2D matrices element-wise"""
 
+from operator import add
+MatrixView = __import__('matrix_view').MatrixView
+as_view = __import__('matrix_view').as_view
+
 
 def add_matrices2D(mat1, mat2):
     """Adds two matrices element-wise
@@ -11,8 +15,16 @@ def add_matrices2D(mat1, mat2):
 
     Returns:
         A new matrix containing the sum of the matrices element-wise,
-        or None if mat1 and mat2 are not the same shape
+        or None if mat1 and mat2 are not the same shape. If either
+        matrix is a MatrixView, the sum is a new contiguous MatrixView
     """
+    # Views are added over their flat buffers
+    if isinstance(mat1, MatrixView) or isinstance(mat2, MatrixView):
+        first, second = as_view(mat1), as_view(mat2)
+        if first is None or second is None:
+            return None
+        return first.elementwise(second, add)
+
     # Check if matrices have the same shape
     if len(mat1) != len(mat2):
         return None
@@ -1,15 +1,18 @@
 #!/usr/bin/env python3
 """Function to concatenate two arrays"""
 
+nd_concat = __import__('nested_list').nd_concat
+
 
 def cat_arrays(arr1, arr2):
     """Concatenates two arrays
 
     Args:
-        arr1: First array (list of ints/floats)
-        arr2: Second array (list of ints/floats)
+        arr1: First array (nested list of ints/floats, of any dimension)
+        arr2: Second array (nested list of ints/floats, of any dimension)
 
     Returns:
-        A new list containing the elements of arr1 followed by elements of arr2
+        A new list containing the elements of arr1 followed by elements of
+        arr2, or None if their inner dimensions do not match
     """
-    return arr1 + arr2
+    return nd_concat(arr1, arr2, 0)
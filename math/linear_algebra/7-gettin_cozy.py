@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """Function to concatenate two matrices along a specified axis"""
 
+MatrixView = __import__('matrix_view').MatrixView
+as_view = __import__('matrix_view').as_view
+
 
 def cat_matrices2D(mat1, mat2, axis=0):
     """Concatenates two matrices along a specified axis
@@ -12,8 +15,16 @@ def cat_matrices2D(mat1, mat2, axis=0):
 
     Returns:
         A new matrix containing the concatenated matrices,
-        or None if they cannot be concatenated
+        or None if they cannot be concatenated. If either matrix is a
+        MatrixView, a MatrixView that references both without copying
     """
+    # Views are joined in O(1); elements are only copied on mutation
+    if isinstance(mat1, MatrixView) or isinstance(mat2, MatrixView):
+        first, second = as_view(mat1), as_view(mat2)
+        if axis not in (0, 1) or first is None or second is None:
+            return None
+        return MatrixView.concatenate(first, second, axis)
+
     # Create deep copies to avoid modifying the original matrices
     result = [row[:] for row in mat1]
 
@@ -1,13 +1,16 @@
 #!/usr/bin/env python3
 """Function to perform matrix multiplication"""
 
+import numpy as np
 
-def mat_mul(mat1, mat2):
+
+def mat_mul(mat1, mat2, tile=128):
     """Performs matrix multiplication
 
     Args:
         mat1: First 2D matrix (list of lists of ints/floats)
         mat2: Second 2D matrix (list of lists of ints/floats)
+        tile: Side of the square tiles the product is blocked into
 
     Returns:
         A new matrix resulting from the multiplication of mat1 by mat2,
@@ -19,15 +22,64 @@ def mat_mul(mat1, mat2):
 
     # Get dimensions of the resulting matrix
     rows = len(mat1)
+    inner = len(mat2)
     cols = len(mat2[0])
 
     # Initialize result matrix with zeros
     result = [[0 for _ in range(cols)] for _ in range(rows)]
 
-    # Perform matrix multiplication
-    for i in range(rows):
-        for j in range(cols):
-            for k in range(len(mat2)):
-                result[i][j] += mat1[i][k] * mat2[k][j]
+    # Perform matrix multiplication tile by tile in i-k-j order, so the
+    # innermost loop walks along rows of mat2 and result instead of down
+    # the columns of mat2
+    for i0 in range(0, rows, tile):
+        for k0 in range(0, inner, tile):
+            for j0 in range(0, cols, tile):
+                j1 = min(j0 + tile, cols)
+                for i in range(i0, min(i0 + tile, rows)):
+                    acc = result[i][j0:j1]
+                    for k in range(k0, min(k0 + tile, inner)):
+                        a = mat1[i][k]
+                        acc = [c + a * b for c, b in
+                               zip(acc, mat2[k][j0:j1])]
+                    result[i][j0:j1] = acc
 
     return result
+
+
+def mat_mul_memmap(mat1, mat2, out, tile=1024):
+    """Performs matrix multiplication tile by tile, for operands that are
+    np.memmap-backed and larger than memory
+
+    Only one tile of each operand and of the output is held in memory at
+    a time; every finished output tile is written straight to out
+
+    Args:
+        mat1: First 2D numpy.ndarray or np.memmap of shape (m, n)
+        mat2: Second 2D numpy.ndarray or np.memmap of shape (n, p)
+        out: 2D numpy.ndarray or np.memmap of shape (m, p) to write the
+             product into
+        tile: Side of the square tiles the product is blocked into
+
+    Returns:
+        out, or None if the matrices cannot be multiplied into out
+    """
+    m, n = mat1.shape
+    p = mat2.shape[1]
+    if mat2.shape[0] != n or out.shape != (m, p):
+        return None
+
+    for i0 in range(0, m, tile):
+        i1 = min(i0 + tile, m)
+        for j0 in range(0, p, tile):
+            j1 = min(j0 + tile, p)
+            block = np.zeros((i1 - i0, j1 - j0), dtype=out.dtype)
+            for k0 in range(0, n, tile):
+                k1 = min(k0 + tile, n)
+                block += np.asarray(mat1[i0:i1, k0:k1]) @ np.asarray(
+                    mat2[k0:k1, j0:j1])
+            out[i0:i1, j0:j1] = block
+
+    if isinstance(out, np.memmap):
+        out.flush()
+
+    return out
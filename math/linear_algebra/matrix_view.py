@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""Strided view over a flat buffer for list of lists matrices"""
+
+from array import array
+
+
+class MatrixView:
+    """Class that represents a 2D matrix as a view over a flat buffer
+
+    The buffer is an array.array (or a list for values it cannot hold
+    exactly) read through a shape, strides and an offset, so transposing
+    only swaps metadata. A concatenation keeps references to its two
+    parts instead of copying them. Elements are only copied when a view
+    sharing its data is mutated, or when it is converted back to lists
+    """
+
+    def __init__(self, data, shape, strides=None, offset=0):
+        """Class constructor
+
+        Args:
+            data: Flat array.array or list holding the elements
+            shape: (rows, cols) tuple of the matrix
+            strides: Step in data between consecutive rows and columns,
+                     row-major by default
+            offset: Index in data of element (0, 0)
+        """
+        self.data = data
+        self.shape = tuple(shape)
+        if strides is None:
+            strides = (self.shape[1], 1)
+        self.strides = tuple(strides)
+        self.offset = offset
+        self.parts = None
+        self.axis = None
+        self.shared = False
+
+    @classmethod
+    def from_list(cls, matrix):
+        """Copies a list of lists into a new view
+
+        Args:
+            matrix: 2D matrix (list of lists of ints/floats)
+
+        Returns:
+            A row-major MatrixView of matrix, or None if matrix is not a
+            list of lists of equal length
+        """
+        if (not isinstance(matrix, list) or
+                not all(isinstance(row, list) for row in matrix)):
+            return None
+        rows = len(matrix)
+        cols = len(matrix[0]) if rows else 0
+        if any(len(row) != cols for row in matrix):
+            return None
+        return cls(pack([value for row in matrix for value in row]),
+                   (rows, cols))
+
+    @classmethod
+    def concatenate(cls, first, second, axis=0):
+        """Joins two views along an axis without copying
+
+        Args:
+            first: First MatrixView
+            second: Second MatrixView
+            axis: 0 to stack rows, 1 to join columns
+
+        Returns:
+            A MatrixView of the concatenation, or None if the shapes do
+            not match along the other axis
+        """
+        if first.shape[1 - axis] != second.shape[1 - axis]:
+            return None
+
+        shape = list(first.shape)
+        shape[axis] += second.shape[axis]
+        view = cls(None, shape, (0, 0))
+        view.parts = (first.snapshot(), second.snapshot())
+        view.axis = axis
+        view.shared = True
+        return view
+
+    def snapshot(self):
+        """Takes a view of the current elements that later writes to this
+        view do not reach
+
+        Returns:
+            A MatrixView sharing the buffer, or the parts of a
+            concatenation, as they are now
+        """
+        if self.parts is not None:
+            view = MatrixView(None, self.shape, (0, 0))
+            view.parts = self.parts
+            view.axis = self.axis
+        else:
+            view = MatrixView(self.data, self.shape, self.strides,
+                              self.offset)
+        view.shared = self.shared = True
+        return view
+
+    def transpose(self):
+        """Transposes the view without copying
+
+        Returns:
+            A MatrixView of the transpose
+        """
+        if self.parts is not None:
+            first, second = self.parts
+            return MatrixView.concatenate(first.transpose(),
+                                          second.transpose(), 1 - self.axis)
+
+        view = MatrixView(self.data, self.shape[::-1], self.strides[::-1],
+                          self.offset)
+        view.shared = self.shared = True
+        return view
+
+    def row(self, i):
+        """Reads one row of the view
+
+        Args:
+            i: Row index
+
+        Returns:
+            The row as a new list
+        """
+        if self.parts is not None:
+            first, second = self.parts
+            if self.axis == 1:
+                return first.row(i) + second.row(i)
+            if i < first.shape[0]:
+                return first.row(i)
+            return second.row(i - first.shape[0])
+
+        start = self.offset + i * self.strides[0]
+        stop = start + self.shape[1] * self.strides[1]
+        return list(self.data[start:stop:self.strides[1]])
+
+    def tolist(self):
+        """Converts the view back to a list of lists
+
+        Returns:
+            The matrix as a new list of lists
+        """
+        return [self.row(i) for i in range(self.shape[0])]
+
+    def values(self):
+        """Iterates over the elements in row-major order"""
+        rows, cols = self.shape
+        if (self.parts is None and self.strides == (cols, 1) and
+                self.offset == 0 and len(self.data) == rows * cols):
+            return iter(self.data)
+        return (value for i in range(rows) for value in self.row(i))
+
+    def elementwise(self, other, operation):
+        """Combines two views of the same shape element by element into a
+        new contiguous view
+
+        Args:
+            other: Other MatrixView
+            operation: Binary function applied to each pair of elements
+
+        Returns:
+            The resulting MatrixView, or None if the shapes differ
+        """
+        if self.shape != other.shape:
+            return None
+        return MatrixView(pack(list(map(operation, self.values(),
+                                        other.values()))), self.shape)
+
+    def own(self):
+        """Copies the elements into a private row-major buffer, once,
+        before a view that shares its data is mutated"""
+        if self.shared:
+            self.data = pack(list(self.values()))
+            self.strides = (self.shape[1], 1)
+            self.offset = 0
+            self.parts = None
+            self.axis = None
+            self.shared = False
+
+    def __getitem__(self, index):
+        """Reads element view[i, j], or row view[i] as a list"""
+        if not isinstance(index, tuple):
+            return self.row(index)
+
+        i, j = index
+        if self.parts is not None:
+            first, second = self.parts
+            split = first.shape[self.axis]
+            position = index[self.axis]
+            if position < split:
+                return first[i, j]
+            if self.axis == 0:
+                return second[i - split, j]
+            return second[i, j - split]
+
+        return self.data[self.offset + i * self.strides[0] +
+                         j * self.strides[1]]
+
+    def __setitem__(self, index, value):
+        """Writes element view[i, j], copying shared data first"""
+        self.own()
+        i, j = index
+        position = self.offset + i * self.strides[0] + j * self.strides[1]
+        try:
+            self.data[position] = value
+        except (TypeError, OverflowError):
+            self.data = list(self.data)
+            self.data[position] = value
+
+    def __len__(self):
+        """Returns the number of rows"""
+        return self.shape[0]
+
+    def __iter__(self):
+        """Iterates over the rows as lists"""
+        return (self.row(i) for i in range(self.shape[0]))
+
+    def __eq__(self, other):
+        """Compares the elements with a view or a list of lists"""
+        if isinstance(other, MatrixView):
+            other = other.tolist()
+        return self.tolist() == other
+
+    def __repr__(self):
+        """Represents the view as its list of lists"""
+        return repr(self.tolist())
+
+
+def pack(values):
+    """Stores values in the most compact flat buffer that holds them
+    exactly
+
+    Args:
+        values: List of ints/floats
+
+    Returns:
+        An array.array of ints or floats, or the list itself
+    """
+    if all(type(value) is int for value in values):
+        try:
+            return array('q', values)
+        except OverflowError:
+            return values
+    if all(type(value) is float for value in values):
+        return array('d', values)
+    return values
+
+
+def as_view(matrix):
+    """Wraps a list of lists in a MatrixView, leaving views unchanged
+
+    Returns:
+        A MatrixView, or None if matrix is a ragged list of lists
+    """
+    if isinstance(matrix, MatrixView):
+        return matrix
+    return MatrixView.from_list(matrix)
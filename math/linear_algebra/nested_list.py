@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""N-dimensional engine for nested list arrays
+
+Nested lists are flattened once into a flat buffer plus a shape tuple,
+operated on over that buffer, and only rebuilt into nested lists for the
+result
+"""
+
+from operator import add
+
+
+def shape_of(array):
+    """Calculates the shape of a nested list from its first elements
+
+    Args:
+        array: Nested list of ints/floats
+
+    Returns:
+        A list of integers representing the dimensions of the array
+    """
+    shape = []
+    current = array
+
+    while isinstance(current, list):
+        shape.append(len(current))
+        if len(current) == 0:
+            break
+        current = current[0]
+
+    return shape
+
+
+def flatten(array):
+    """Flattens a nested list into a row-major buffer, one depth at a time
+
+    Args:
+        array: Nested list of ints/floats
+
+    Returns:
+        A tuple (values, shape) with the flat list of values and the shape
+        tuple, or None if the nested lists are ragged
+    """
+    shape = tuple(shape_of(array))
+    level = [array]
+    for size in shape:
+        flat = []
+        for item in level:
+            if not isinstance(item, list) or len(item) != size:
+                return None
+            flat.extend(item)
+        level = flat
+
+    if any(isinstance(value, list) for value in level):
+        return None
+
+    return level, shape
+
+
+def unflatten(values, shape):
+    """Rebuilds nested lists from a row-major buffer
+
+    Args:
+        values: Flat list of values
+        shape: Shape tuple of the array
+
+    Returns:
+        The nested list of the given shape
+    """
+    if len(shape) == 0:
+        return values[0]
+
+    # Group the innermost axis first, one depth at a time
+    level = values
+    for depth in range(len(shape) - 1, 0, -1):
+        size = shape[depth]
+        count = product(shape[:depth])
+        level = [level[i * size:(i + 1) * size] for i in range(count)]
+
+    return list(level)
+
+
+def product(sizes):
+    """Multiplies the sizes of a shape together"""
+    result = 1
+    for size in sizes:
+        result *= size
+    return result
+
+
+def strides_of(shape):
+    """Calculates the row-major strides of a shape"""
+    strides = []
+    step = 1
+    for size in reversed(shape):
+        strides.append(step)
+        step *= size
+    return tuple(reversed(strides))
+
+
+def nd_add(array1, array2):
+    """Adds two nested list arrays element-wise over their flat buffers
+
+    Args:
+        array1: First nested list of ints/floats
+        array2: Second nested list of ints/floats
+
+    Returns:
+        A new nested list with the element-wise sum, or None if the arrays
+        are ragged or do not have the same shape
+    """
+    flat1 = flatten(array1)
+    flat2 = flatten(array2)
+    if flat1 is None or flat2 is None or flat1[1] != flat2[1]:
+        return None
+
+    return unflatten(list(map(add, flat1[0], flat2[0])), flat1[1])
+
+
+def nd_concat(array1, array2, axis=0):
+    """Concatenates two nested list arrays along an axis over their flat
+    buffers
+
+    Args:
+        array1: First nested list of ints/floats
+        array2: Second nested list of ints/floats
+        axis: Axis along which to concatenate
+
+    Returns:
+        A new nested list with the concatenation, or None if the arrays
+        are ragged or their other dimensions do not match
+    """
+    flat1 = flatten(array1)
+    flat2 = flatten(array2)
+    if flat1 is None or flat2 is None:
+        return None
+
+    values1, shape1 = flat1
+    values2, shape2 = flat2
+    if (len(shape1) != len(shape2) or not 0 <= axis < len(shape1) or
+            shape1[:axis] + shape1[axis + 1:] !=
+            shape2[:axis] + shape2[axis + 1:]):
+        return None
+
+    # Each of the outer blocks is one chunk of array1 then one of array2
+    outer = product(shape1[:axis])
+    chunk1 = product(shape1[axis:])
+    chunk2 = product(shape2[axis:])
+    values = []
+    for i in range(outer):
+        values.extend(values1[i * chunk1:(i + 1) * chunk1])
+        values.extend(values2[i * chunk2:(i + 1) * chunk2])
+
+    shape = shape1[:axis] + (shape1[axis] + shape2[axis],) + shape1[axis + 1:]
+    return unflatten(values, shape)
+
+
+def nd_slice(array, slices):
+    """Slices a nested list array over its flat buffer
+
+    Args:
+        array: Nested list of ints/floats
+        slices: Tuple of slice objects, one per leading axis; missing
+                axes are kept whole
+
+    Returns:
+        A new nested list with the selected elements, or None if the
+        array is ragged
+    """
+    flat = flatten(array)
+    if flat is None:
+        return None
+
+    values, shape = flat
+    strides = strides_of(shape)
+    offsets = [0]
+    new_shape = []
+    for axis, size in enumerate(shape):
+        part = slices[axis] if axis < len(slices) else slice(None)
+        indices = range(size)[part]
+        new_shape.append(len(indices))
+        offsets = [offset + i * strides[axis]
+                   for offset in offsets for i in indices]
+
+    return unflatten([values[offset] for offset in offsets],
+                     tuple(new_shape))
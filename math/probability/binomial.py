@@ -1,6 +1,23 @@
 #!/usr/bin/env python3
 """Initialize Binomial, normal distribution"""
 
+import math
+
+MAX_FACTORIALS = 1 << 16
+
+log_factorials = [0.0]
+
+
+def log_factorial(x):
+    """Function that returns log(x!) from a table grown lazily up to
+    MAX_FACTORIALS entries, and from log-gamma beyond it"""
+    if x >= MAX_FACTORIALS:
+        return math.lgamma(x + 1)
+    if x >= len(log_factorials):
+        log_factorials.extend(math.lgamma(i + 1)
+                              for i in range(len(log_factorials), x + 1))
+    return log_factorials[x]
+
 
 class Binomial:
     """Class that represents a binomial distribution"""
@@ -43,10 +60,19 @@ class Binomial:
         k = int(k)
         if k < 0 or k > self.n:
             return 0
-        firstPart = self.factorial(self.n) / (
-            self.factorial(k) * self.factorial(self.n - k))
-        secondPart = (self.p**k) * ((1 - self.p)**(self.n - k))
-        return firstPart * secondPart
+        # The coefficient comes from the cached log factorial table
+        logPmf = (log_factorial(self.n) - log_factorial(k) -
+                  log_factorial(self.n - k))
+        # A zero exponent contributes nothing, even when p is 0 or 1
+        if k > 0:
+            if self.p <= 0:
+                return 0.0
+            logPmf += k * math.log(self.p)
+        if self.n - k > 0:
+            if self.p >= 1:
+                return 0.0
+            logPmf += (self.n - k) * math.log1p(-self.p)
+        return math.exp(logPmf)
 
     def cdf(self, k):
         """Function that calculates the value of the CDF for a given number